@@ -4,7 +4,10 @@ Database configuration and connection management
 import sqlite3
 import os
 from contextlib import contextmanager
-from typing import Generator
+from typing import Callable, Generator, List
+from app.config.settings import config
+from app.utils.database import configure_connection
+from app.utils.logging import logger, log_exception
 
 
 DATABASE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'devprep_problems.db')
@@ -19,6 +22,7 @@ def get_db_connection() -> Generator[sqlite3.Connection, None, None]:
     try:
         conn = sqlite3.connect(DATABASE_PATH)
         conn.row_factory = sqlite3.Row  # Enable dict-like access to rows
+        configure_connection(conn)
         yield conn
     except Exception as e:
         if conn:
@@ -29,11 +33,268 @@ def get_db_connection() -> Generator[sqlite3.Connection, None, None]:
             conn.close()
 
 
+def _table_exists(conn: sqlite3.Connection, table: str) -> bool:
+    """Check whether a table exists"""
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    ).fetchone()
+    return row is not None
+
+
+def _column_exists(conn: sqlite3.Connection, table: str, column: str) -> bool:
+    """Check whether a column exists (table_xinfo also lists generated columns)"""
+    return any(row[1] == column for row in conn.execute(f"PRAGMA table_xinfo({table})"))
+
+
+def _has_unique_index(conn: sqlite3.Connection, table: str, column: str) -> bool:
+    """Check whether a UNIQUE constraint or index already covers exactly this column"""
+    for index in conn.execute(f"PRAGMA index_list({table})"):
+        if index['unique'] and [row['name'] for row in conn.execute(f"PRAGMA index_info({index['name']})")] == [column]:
+            return True
+    return False
+
+
+def _add_question_difficulty_order(conn: sqlite3.Connection) -> None:
+    """Add a numeric difficulty rank so difficulty sorting can use an index"""
+    if not _table_exists(conn, "questions"):
+        return
+    if not _column_exists(conn, "questions", "difficulty_order"):
+        conn.execute("""
+            ALTER TABLE questions ADD COLUMN difficulty_order INTEGER
+            GENERATED ALWAYS AS (
+                CASE difficulty WHEN 'EASY' THEN 1 WHEN 'MEDIUM' THEN 2 ELSE 3 END
+            ) VIRTUAL
+        """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_q_difforder_id ON questions(difficulty_order, id)")
+
+
+def _add_company_link_indexes(conn: sqlite3.Connection) -> None:
+    """Covering indexes for the company/time-period EXISTS probes"""
+    if _table_exists(conn, "company_questions"):
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_cq_question_company_period
+            ON company_questions(question_id, company_id, time_period)
+        """)
+    if _table_exists(conn, "user_question_companies"):
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_uqc_question_company_period
+            ON user_question_companies(user_question_id, company_id, time_period)
+        """)
+
+
+# Recompute the denormalized questions.max_frequency for one question
+_REFRESH_MAX_FREQUENCY_SQL = """
+    UPDATE questions SET max_frequency = (
+        SELECT MAX(frequency) FROM company_questions WHERE question_id = {question_id}
+    ) WHERE id = {question_id}
+"""
+
+
+def _add_question_max_frequency(conn: sqlite3.Connection) -> None:
+    """Keep each question's highest company frequency on the row so frequency sorting needs no join"""
+    if not (_table_exists(conn, "questions") and _table_exists(conn, "company_questions")):
+        return
+    if not _column_exists(conn, "questions", "max_frequency"):
+        conn.execute("ALTER TABLE questions ADD COLUMN max_frequency REAL")
+        conn.execute(_REFRESH_MAX_FREQUENCY_SQL.format(question_id="questions.id"))
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_q_maxfreq_id ON questions(max_frequency, id)")
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_company_questions_maxfreq_insert
+        AFTER INSERT ON company_questions
+        BEGIN {_REFRESH_MAX_FREQUENCY_SQL.format(question_id="NEW.question_id")}; END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_company_questions_maxfreq_update
+        AFTER UPDATE OF frequency, question_id ON company_questions
+        BEGIN
+            {_REFRESH_MAX_FREQUENCY_SQL.format(question_id="OLD.question_id")};
+            {_REFRESH_MAX_FREQUENCY_SQL.format(question_id="NEW.question_id")};
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_company_questions_maxfreq_delete
+        AFTER DELETE ON company_questions
+        BEGIN {_REFRESH_MAX_FREQUENCY_SQL.format(question_id="OLD.question_id")}; END
+    """)
+
+
+# questions.topics is a comma-separated string; turn it into a JSON array
+# so it can be split with json_each (CTEs are not allowed inside triggers).
+# json_quote escapes quotes, backslashes and control characters, and no JSON
+# escape contains a comma, so splitting its output on commas stays valid.
+_CSV_AS_JSON = """'[' || replace(json_quote({column}), ',', '","') || ']'"""
+
+# Insert the topics of one row into its link table, skipping blanks and malformed values
+_INSERT_TOPICS_SQL = """
+    INSERT OR IGNORE INTO {link_table}({link_column}, topic)
+    SELECT {row_id}, trim(j.value)
+    FROM {source}json_each(CASE WHEN json_valid({topics}) THEN {topics} ELSE '[]' END) j
+    WHERE j.type = 'text' AND trim(j.value) <> ''
+"""
+
+# (source table, link table, link column, topics as JSON)
+_TOPIC_LINK_TABLES = (
+    ("questions", "question_topics", "question_id", _CSV_AS_JSON),
+    ("user_questions", "user_question_topics", "user_question_id", "{column}"),
+)
+
+
+def _ensure_trigger(conn: sqlite3.Connection, name: str, sql: str) -> bool:
+    """Create a trigger, replacing one with a different definition; True if (re)created"""
+    row = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = ?", (name,)
+    ).fetchone()
+    if row is not None:
+        if row[0] == sql.strip():
+            return False
+        conn.execute(f"DROP TRIGGER {name}")
+    conn.execute(sql)
+    return True
+
+
+def _add_topic_link_tables(conn: sqlite3.Connection) -> None:
+    """Normalize topics into indexed link tables kept in sync by triggers"""
+    for source, link_table, link_column, topics_json in _TOPIC_LINK_TABLES:
+        if not _table_exists(conn, source):
+            continue
+        backfill = not _table_exists(conn, link_table)
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {link_table} (
+                {link_column} INTEGER NOT NULL,
+                topic TEXT NOT NULL COLLATE NOCASE,
+                PRIMARY KEY ({link_column}, topic)
+            ) WITHOUT ROWID
+        """)
+        conn.execute(f"""
+            CREATE INDEX IF NOT EXISTS idx_{link_table}_topic
+            ON {link_table}(topic, {link_column})
+        """)
+
+        def insert_sql(prefix: str, from_source: str = "") -> str:
+            topics = topics_json.format(column=f"{prefix}topics")
+            return _INSERT_TOPICS_SQL.format(
+                link_table=link_table, link_column=link_column,
+                row_id=f"{prefix}id", source=from_source, topics=topics,
+            )
+
+        # Triggers from an older definition are replaced, and the link table is
+        # backfilled again for rows the old definition may have skipped
+        if _ensure_trigger(conn, f"trg_{source}_topics_insert", f"""
+            CREATE TRIGGER trg_{source}_topics_insert
+            AFTER INSERT ON {source}
+            BEGIN {insert_sql("NEW.")}; END
+        """):
+            backfill = True
+        _ensure_trigger(conn, f"trg_{source}_topics_update", f"""
+            CREATE TRIGGER trg_{source}_topics_update
+            AFTER UPDATE OF topics ON {source}
+            BEGIN
+                DELETE FROM {link_table} WHERE {link_column} = OLD.id;
+                {insert_sql("NEW.")};
+            END
+        """)
+        _ensure_trigger(conn, f"trg_{source}_topics_delete", f"""
+            CREATE TRIGGER trg_{source}_topics_delete
+            AFTER DELETE ON {source}
+            BEGIN DELETE FROM {link_table} WHERE {link_column} = OLD.id; END
+        """)
+        if backfill:
+            conn.execute(insert_sql("s.", f"{source} s, "))
+
+
+def _add_favorite_unique_indexes(conn: sqlite3.Connection) -> None:
+    """One favorite per user and question, so toggling can rely on INSERT OR IGNORE"""
+    if not _table_exists(conn, "user_favorites"):
+        return
+    conn.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_uf_user_question
+        ON user_favorites(user_id, question_id) WHERE question_id IS NOT NULL
+    """)
+    conn.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_uf_user_user_question
+        ON user_favorites(user_id, user_question_id) WHERE user_question_id IS NOT NULL
+    """)
+
+
+def _add_user_question_listing_indexes(conn: sqlite3.Connection) -> None:
+    """Let the newest-first user question listings read rows in index order"""
+    if not _table_exists(conn, "user_questions"):
+        return
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_uq_createdby_created
+        ON user_questions(created_by, created_at DESC, id DESC)
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_uq_created
+        ON user_questions(created_at DESC, id DESC)
+    """)
+
+
+def _add_approval_indexes(conn: sqlite3.Connection) -> None:
+    """Index approval request lookups and the pending queue, and references by user question"""
+    if _table_exists(conn, "approval_requests"):
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_ar_lookup
+            ON approval_requests(entity_type, entity_id, request_type, status)
+        """)
+        # Only pending rows are queued, so the partial index stays small as history grows
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_ar_pending
+            ON approval_requests(created_at) WHERE status = 'pending'
+        """)
+    if _table_exists(conn, "question_references"):
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_qref_user_question
+            ON question_references(user_question_id, is_approved)
+        """)
+
+
+def _add_user_lookup_indexes(conn: sqlite3.Connection) -> None:
+    """Index the login and registration lookups by email and username"""
+    if not _table_exists(conn, "users"):
+        return
+    # Tables created with UNIQUE columns already carry an equivalent autoindex
+    for column in ("email", "username"):
+        if not _has_unique_index(conn, "users", column):
+            conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS idx_users_{column} ON users({column})")
+
+
+# Idempotent migrations, applied in order on startup
+MIGRATIONS: List[Callable[[sqlite3.Connection], None]] = [
+    _add_question_difficulty_order,
+    _add_company_link_indexes,
+    _add_topic_link_tables,
+    _add_question_max_frequency,
+    _add_favorite_unique_indexes,
+    _add_user_question_listing_indexes,
+    _add_approval_indexes,
+    _add_user_lookup_indexes,
+]
+
+
 def init_database():
     """
-    Initialize database with required tables
+    Initialize database and apply pending migrations
     """
+    if not os.path.exists(DATABASE_PATH):
+        logger.error(f"Database file not found at: {DATABASE_PATH}, skipping migrations")
+        return
+
     with get_db_connection() as conn:
-        # Database is already initialized
-        # This function can be used for future migrations
-        pass
+        try:
+            # Persistent journal mode, so connections don't have to re-assert it
+            conn.execute(f"PRAGMA journal_mode={config.database.journal_mode}").fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not set journal_mode={config.database.journal_mode}: {e}")
+        
+        for migration in MIGRATIONS:
+            try:
+                # sqlite3 does not open a transaction for DDL, so without an explicit
+                # BEGIN a failed backfill would leave its CREATE TABLE committed
+                conn.execute("BEGIN")
+                migration(conn)
+                conn.commit()
+                logger.debug(f"Applied migration {migration.__name__}")
+            except sqlite3.Error as e:
+                conn.rollback()
+                log_exception(e, f"Migration {migration.__name__} failed")
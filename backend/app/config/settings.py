@@ -3,7 +3,7 @@ Application configuration
 """
 import os
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Tuple
 
 
 @dataclass
@@ -11,6 +11,19 @@ class DatabaseConfig:
     """Database configuration"""
     url: str = "devprep_problems.db"
     echo: bool = False
+    # Prepared statements kept per connection (sqlite3 default is 128)
+    statement_cache_size: int = 512
+    # Stored in the database file, so it is set once at startup. WAL lets reads
+    # proceed during a write, but keeps -wal/-shm files next to the database
+    # that belong with it (copy all three, or checkpoint first, when moving it).
+    journal_mode: str = "WAL"
+    # Applied to every new connection
+    pragmas: Tuple[str, ...] = (
+        "synchronous=NORMAL",
+        "temp_store=MEMORY",
+        "mmap_size=268435456",
+        "cache_size=-65536",
+    )
 
 
 @dataclass
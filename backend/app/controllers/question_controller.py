@@ -1,7 +1,7 @@
 """
 Question controller for API endpoints
 """
-from typing import List, Optional
+from typing import Optional, Sequence
 from fastapi import Depends, Query, Header
 from app.controllers.base_controller import BaseController
 from app.services.question_service import QuestionService
@@ -77,21 +77,21 @@ class QuestionController(BaseController):
         except Exception as e:
             self.handle_error(e, "Error retrieving questions")
     
-    def get_difficulties(self) -> List[str]:
+    def get_difficulties(self) -> Sequence[str]:
         """Get all difficulty levels"""
         try:
             return self.question_service.get_all_difficulties()
         except Exception as e:
             self.handle_error(e, "Error retrieving difficulties")
     
-    def get_time_periods(self) -> List[str]:
+    def get_time_periods(self) -> Sequence[str]:
         """Get all time periods"""
         try:
             return self.question_service.get_all_time_periods()
         except Exception as e:
             self.handle_error(e, "Error retrieving time periods")
     
-    def get_topics(self) -> List[str]:
+    def get_topics(self) -> Sequence[str]:
         """Get all unique topics"""
         try:
             return self.question_service.get_all_topics()
@@ -101,7 +101,7 @@ class QuestionController(BaseController):
     def get_stats(self) -> OverallStats:
         """Get overall statistics"""
         try:
-            return self.question_service.get_overall_stats()
+            return self.question_service.get_stats()
         except Exception as e:
             self.handle_error(e, "Error retrieving statistics")
             
@@ -44,7 +44,9 @@ class UserQuestionController:
     
     def get_questions(self, user_id: Optional[int] = None, is_public_only: bool = False,
                      is_approved_only: bool = False, created_by: Optional[int] = None,
-                     page: int = 1, per_page: int = 20) -> QuestionListResponse:
+                     page: int = 1, per_page: int = 20,
+                     cursor_created_at: Optional[str] = None,
+                     cursor_id: Optional[int] = None) -> QuestionListResponse:
         """Get user questions with filtering"""
         if per_page > 100:
             per_page = 100  # Limit max per page
@@ -55,7 +57,9 @@ class UserQuestionController:
             is_approved_only=is_approved_only,
             created_by=created_by,
             page=page,
-            per_page=per_page
+            per_page=per_page,
+            cursor_created_at=cursor_created_at,
+            cursor_id=cursor_id
         )
     
     def update_question(self, question_id: int, question_data: UserQuestionUpdate,
@@ -121,6 +125,18 @@ class UserQuestionController:
                 detail=f"Failed to create reference: {str(e)}"
             )
     
+    def create_references_bulk(self, references: List[QuestionReferenceCreate],
+                               user_id: int) -> Dict[str, int]:
+        """Create several question references"""
+        try:
+            created = self.service.create_question_references_bulk(references, user_id)
+            return {"created": created}
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Failed to create references: {str(e)}"
+            )
+    
     def get_references(self, question_id: Optional[int] = None,
                       user_question_id: Optional[int] = None,
                       user_id: Optional[int] = None) -> List[QuestionReferenceResponse]:
@@ -152,6 +168,19 @@ class UserQuestionController:
                 detail=f"Failed to create company association: {str(e)}"
             )
     
+    def create_company_associations_bulk(self, question_id: int, companies, user_id: int) -> Dict[str, int]:
+        """Create several company associations for a user question"""
+        try:
+            created = self.service.create_company_associations_bulk(question_id, companies, user_id)
+            return {"created": created}
+        except Exception as e:
+            from app.utils.logging import logger
+            logger.error(f"Failed to create company associations: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Failed to create company associations: {str(e)}"
+            )
+    
     def toggle_favorite(self, user_id: int, question_id: Optional[int] = None,
                        user_question_id: Optional[int] = None) -> Dict[str, str]:
         """Toggle question favorite status"""
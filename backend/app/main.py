@@ -5,6 +5,7 @@ import os
 from fastapi import FastAPI, Depends, Header, Query
 from fastapi.middleware.cors import CORSMiddleware
 from app.config.settings import config
+from app.config.database import init_database
 from app.utils.logging import logger
 from app.controllers.question_controller import QuestionController
 from app.controllers.company_controller import CompanyController
@@ -19,7 +20,7 @@ from app.schemas.user_question_schemas import (
 )
 from app.utils.auth import get_current_active_user, get_admin_user, get_current_user_optional
 from app.models.user_models import User
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 
 
 def create_app() -> FastAPI:
@@ -33,6 +34,9 @@ def create_app() -> FastAPI:
         os.makedirs(logs_dir)
         logger.info(f"Created logs directory at {logs_dir}")
     
+    # Apply schema migrations (indexes, derived columns)
+    init_database()
+    
     app = FastAPI(
         title=config.title,
         version=config.version,
@@ -66,17 +70,17 @@ def create_app() -> FastAPI:
         """Get all companies"""
         return company_controller.get_companies()
     
-    @app.get("/api/difficulties")
+    @app.get("/api/difficulties", response_model=List[str])
     async def get_difficulties():
         """Get all difficulty levels"""
         return question_controller.get_difficulties()
     
-    @app.get("/api/time-periods")
+    @app.get("/api/time-periods", response_model=List[str])
     async def get_time_periods():
         """Get all time periods"""
         return question_controller.get_time_periods()
     
-    @app.get("/api/topics")
+    @app.get("/api/topics", response_model=List[str])
     async def get_topics():
         """Get all unique topics"""
         return question_controller.get_topics()
@@ -192,8 +196,10 @@ def create_app() -> FastAPI:
         is_public_only: bool = False,
         is_approved_only: bool = False,
         created_by: Optional[int] = None,
-        page: int = 1,
+        page: int = Query(1, description="Page number (deprecated: prefer the cursor)"),
         per_page: int = 20,
+        cursor_created_at: Optional[str] = Query(None, description="next_cursor_created_at from the previous page"),
+        cursor_id: Optional[int] = Query(None, description="next_cursor_id from the previous page"),
         current_user: Optional[User] = Depends(get_current_user_optional)
     ):
         """Get user questions with filtering"""
@@ -204,7 +210,9 @@ def create_app() -> FastAPI:
             is_approved_only=is_approved_only,
             created_by=created_by,
             page=page,
-            per_page=per_page
+            per_page=per_page,
+            cursor_created_at=cursor_created_at,
+            cursor_id=cursor_id
         )
     
     @app.get("/api/user-questions/{question_id}", response_model=UserQuestionResponse)
@@ -250,6 +258,14 @@ def create_app() -> FastAPI:
         """Create a question reference"""
         return user_question_controller.create_reference(reference_data, current_user.id)
     
+    @app.post("/api/question-references/bulk")
+    async def create_question_references_bulk(
+        references: List[QuestionReferenceCreate],
+        current_user: User = Depends(get_current_active_user)
+    ):
+        """Create several question references in one request"""
+        return user_question_controller.create_references_bulk(references, current_user.id)
+    
     @app.get("/api/question-references", response_model=List[QuestionReferenceResponse])
     async def get_question_references(
         question_id: Optional[int] = None,
@@ -270,6 +286,15 @@ def create_app() -> FastAPI:
         """Create a company association for user question"""
         return user_question_controller.create_company_association(question_id, company_data, current_user.id)
     
+    @app.post("/api/user-questions/{question_id}/companies/bulk")
+    async def create_company_associations_bulk(
+        question_id: int,
+        companies: List[UserQuestionCompanyCreate],
+        current_user: User = Depends(get_current_active_user)
+    ):
+        """Create several company associations for user question in one request"""
+        return user_question_controller.create_company_associations_bulk(question_id, companies, current_user.id)
+    
     # Favorites routes
     @app.post("/api/favorites/toggle")
     async def toggle_favorite(
@@ -280,13 +305,13 @@ def create_app() -> FastAPI:
         """Toggle question favorite status"""
         return user_question_controller.toggle_favorite(current_user.id, question_id, user_question_id)
     
-    @app.get("/api/favorites")
+    @app.get("/api/favorites", response_model=List[Dict[str, Any]])
     async def get_user_favorites(current_user: User = Depends(get_current_active_user)):
         """Get user's favorite questions"""
         return user_question_controller.get_user_favorites(current_user.id)
     
     # Admin routes
-    @app.get("/api/admin/pending-approvals")
+    @app.get("/api/admin/pending-approvals", response_model=Dict[str, List[Dict[str, Any]]])
     async def get_pending_approvals(admin_user: User = Depends(get_admin_user)):
         """Get pending approval requests (admin only)"""
         return user_question_controller.get_pending_approvals(admin_user.id)
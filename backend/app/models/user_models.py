@@ -2,7 +2,7 @@
 Database models for user management and question features
 """
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Union
 from enum import Enum
 
 
@@ -51,7 +51,7 @@ class QuestionStatus(str, Enum):
 class User:
     def __init__(self, id: int, email: str, username: str, full_name: Optional[str], 
                  password_hash: str, role: UserRole = UserRole.USER, is_active: bool = True,
-                 created_at: datetime = None):
+                 created_at: Union[datetime, str, None] = None):
         self.id = id
         self.email = email
         self.username = username
@@ -59,16 +59,34 @@ class User:
         self.password_hash = password_hash
         self.role = role
         self.is_active = is_active
-        self.created_at = created_at or datetime.now()
+        # Stored timestamp text is parsed on first read; auth checks never read it
+        self._created_at = created_at or datetime.now()
+
+    @property
+    def created_at(self) -> datetime:
+        if isinstance(self._created_at, str):
+            self._created_at = datetime.fromisoformat(self._created_at)
+        return self._created_at
+
+    @created_at.setter
+    def created_at(self, value: Union[datetime, str]) -> None:
+        self._created_at = value
 
 
 class UserQuestion:
+    # Built once per fetched row; slots keep the per-instance footprint small
+    __slots__ = ('id', 'title', 'description', 'difficulty', 'topics', 'solution', 'link',
+                 'is_public', 'is_approved', 'created_by', 'approved_by',
+                 'created_at', 'updated_at', 'approved_at', 'is_favorited',
+                 'creator_username', 'approver_username')
+
     def __init__(self, id: int, title: str, created_by: int, difficulty: QuestionDifficulty,
                  description: Optional[str] = None, topics: Optional[str] = None,
                  solution: Optional[str] = None, link: Optional[str] = None, is_public: bool = False,
                  is_approved: bool = False, approved_by: Optional[int] = None, 
                  created_at: datetime = None, updated_at: datetime = None, 
-                 approved_at: Optional[datetime] = None):
+                 approved_at: Optional[datetime] = None, is_favorited: bool = False,
+                 creator_username: Optional[str] = None, approver_username: Optional[str] = None):
         self.id = id
         self.title = title
         self.description = description
@@ -83,14 +101,22 @@ class UserQuestion:
         self.created_at = created_at or datetime.now()
         self.updated_at = updated_at or datetime.now()
         self.approved_at = approved_at
+        self.is_favorited = is_favorited
+        self.creator_username = creator_username
+        self.approver_username = approver_username
 
 
 class QuestionReference:
+    __slots__ = ('id', 'question_id', 'user_question_id', 'url', 'title', 'description',
+                 'is_approved', 'created_by', 'approved_by', 'created_at', 'approved_at',
+                 'creator_username', 'approver_username')
+
     def __init__(self, id: int, url: str, created_by: int, title: Optional[str] = None,
                  description: Optional[str] = None, is_approved: bool = False,
                  approved_by: Optional[int] = None, question_id: Optional[int] = None, 
                  user_question_id: Optional[int] = None, created_at: datetime = None, 
-                 approved_at: Optional[datetime] = None):
+                 approved_at: Optional[datetime] = None, creator_username: Optional[str] = None,
+                 approver_username: Optional[str] = None):
         self.id = id
         self.question_id = question_id
         self.user_question_id = user_question_id
@@ -102,13 +128,21 @@ class QuestionReference:
         self.approved_by = approved_by
         self.created_at = created_at or datetime.now()
         self.approved_at = approved_at
+        self.creator_username = creator_username
+        self.approver_username = approver_username
 
 
 class UserQuestionCompany:
+    __slots__ = ('id', 'user_question_id', 'company_id', 'time_period', 'frequency',
+                 'is_approved', 'created_by', 'approved_by', 'created_at', 'approved_at',
+                 'company_name', 'creator_username', 'approver_username')
+
     def __init__(self, id: int, user_question_id: int, company_id: int,
                  time_period: str, created_by: int, frequency: float = 1.0,
                  is_approved: bool = False, approved_by: Optional[int] = None,
-                 created_at: datetime = None, approved_at: Optional[datetime] = None):
+                 created_at: datetime = None, approved_at: Optional[datetime] = None,
+                 company_name: Optional[str] = None, creator_username: Optional[str] = None,
+                 approver_username: Optional[str] = None):
         self.id = id
         self.user_question_id = user_question_id
         self.company_id = company_id
@@ -119,6 +153,9 @@ class UserQuestionCompany:
         self.approved_by = approved_by
         self.created_at = created_at or datetime.now()
         self.approved_at = approved_at
+        self.company_name = company_name
+        self.creator_username = creator_username
+        self.approver_username = approver_username
 
 
 class ApprovalRequest:
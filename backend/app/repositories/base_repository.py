@@ -2,7 +2,7 @@
 Base repository class
 """
 from abc import ABC, abstractmethod
-from typing import Any, List, Optional, Dict
+from typing import Any, List, Optional, Dict, Iterator
 from app.utils.database import db_manager
 from app.utils.logging import logger, log_exception
 
@@ -24,7 +24,11 @@ class BaseRepository(ABC):
         pass
     
     def execute_query(self, query: str, params: tuple = ()) -> List[Dict[str, Any]]:
-        """Execute query and return results as dictionaries"""
+        """Execute query and return results as dictionaries.
+        
+        Materializes every row; prefer execute_query_iter for large or
+        single-pass result sets.
+        """
         try:
             logger.debug(f"Executing query: {query}")
             logger.debug(f"Parameters: {params}")
@@ -52,3 +56,17 @@ class BaseRepository(ABC):
         except Exception as e:
             log_exception(e, f"Database query_one error")
             raise
+    
+    def execute_query_iter(self, query: str, params: tuple = (), batch: int = 500) -> Iterator[Dict[str, Any]]:
+        """Execute query and lazily yield results as dictionaries, fetching in batches"""
+        try:
+            logger.debug(f"Executing query (iter): {query}")
+            logger.debug(f"Parameters: {params}")
+            with self.db_manager.get_connection() as conn:
+                cursor = self.db_manager.get_cursor(conn)
+                cursor.execute(query, params)
+                while rows := cursor.fetchmany(batch):
+                    yield from (dict(row) for row in rows)
+        except Exception as e:
+            log_exception(e, f"Database query_iter error")
+            raise
@@ -1,29 +1,78 @@
 """
 Company repository for database operations
 """
-from typing import List, Any, Optional
+import threading
+from typing import Dict, Iterable, List, Any, Optional
 from app.repositories.base_repository import BaseRepository
 
 
+# Fixed query text so each connection's statement cache reuses the compiled plan
+_FIND_ALL_SQL = "SELECT id, name FROM companies ORDER BY name"
+_FIND_BY_ID_SQL = "SELECT id, name FROM companies WHERE id = ?"
+_FIND_BY_NAME_SQL = "SELECT id, name FROM companies WHERE name = ?"
+
+
 class CompanyRepository(BaseRepository):
     """Repository for company-related database operations"""
     
     def find_all(self, **kwargs) -> List[Any]:
         """Find all companies"""
-        query = "SELECT id, name FROM companies ORDER BY name"
-        return self.execute_query(query)
+        return self.execute_query(_FIND_ALL_SQL)
     
     def find_by_id(self, id: int) -> Optional[Any]:
         """Find company by ID"""
-        query = "SELECT id, name FROM companies WHERE id = ?"
-        return self.execute_query_one(query, (id,))
+        return self.execute_query_one(_FIND_BY_ID_SQL, (id,))
     
     def find_by_name(self, name: str) -> Optional[Any]:
         """Find company by name"""
-        query = "SELECT id, name FROM companies WHERE name = ?"
-        return self.execute_query_one(query, (name,))
+        return self.execute_query_one(_FIND_BY_NAME_SQL, (name,))
     
     def get_all_companies(self) -> List[dict]:
         """Get all companies as list of dictionaries"""
         companies = self.find_all()
         return [{'id': company[0], 'name': company[1]} for company in companies]
+
+
+class CompanyNameCache:
+    """Singleton in-process map of company name to id.
+    
+    The companies table is tiny and rarely written, so filter values are
+    resolved to ids in Python and queries can match on company_id without
+    joining companies. Call invalidate() after writing to companies.
+    """
+    
+    _instance = None
+    
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._ids = None
+            cls._instance._lock = threading.Lock()
+        return cls._instance
+    
+    def _load(self) -> Dict[str, int]:
+        ids = self._ids
+        if ids is None:
+            with self._lock:
+                if self._ids is None:
+                    self._ids = {row['name']: row['id'] for row in CompanyRepository().find_all()}
+                ids = self._ids
+        return ids
+    
+    def get_id(self, name: str) -> Optional[int]:
+        """Resolve a company name to its id"""
+        return self._load().get(name)
+    
+    def get_ids(self, names: Iterable[str]) -> List[int]:
+        """Resolve company names to ids, skipping unknown names"""
+        ids = self._load()
+        return [ids[name] for name in names if name in ids]
+    
+    def invalidate(self) -> None:
+        """Drop the cached map so the next lookup reloads it"""
+        with self._lock:
+            self._ids = None
+
+
+# Global company name cache instance
+company_name_cache = CompanyNameCache()
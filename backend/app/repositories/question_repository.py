@@ -1,24 +1,253 @@
 """
 Question repository for database operations
 """
-from typing import List, Dict, Any, Optional, Tuple
+import json
+import random
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 from app.repositories.base_repository import BaseRepository
-from app.schemas.question_schemas import QuestionFilters
+from app.repositories.company_repository import company_name_cache
+from app.schemas.question_schemas import QuestionFilters, SortByEnum, SortOrderEnum, DifficultyEnum
+from app.utils.cache import TTLCache
 from app.utils.logging import logger, log_exception
 
 
+# IN-list bound as a single JSON array parameter, so the SQL text does not
+# depend on the list length and the statement cache can reuse it
+_JSON_IN_LIST = "(SELECT value FROM json_each(?))"
+
+# Filter fragments, built once at import rather than formatted per request
+_DIFFICULTY_IN = f"difficulty IN {_JSON_IN_LIST}"
+_Q_DIFFICULTY_IN = f"q.difficulty IN {_JSON_IN_LIST}"
+_Q_DIFFICULTY_ORDER_IN = f"q.difficulty_order IN {_JSON_IN_LIST}"
+_CQ_COMPANY_IN = f"cq.company_id IN {_JSON_IN_LIST}"
+_CQ_TIME_PERIOD_IN = f"cq.time_period IN {_JSON_IN_LIST}"
+_CQ_COMPANY_IN_OR_NULL = f"({_CQ_COMPANY_IN} OR cq.company_id IS NULL)"
+_CQ_TIME_PERIOD_IN_OR_NULL = f"({_CQ_TIME_PERIOD_IN} OR cq.time_period IS NULL)"
+_QC_COMPANY_IN = f"qc.company_id IN {_JSON_IN_LIST}"
+_UQC_COMPANY_IN = f"uqc.company_id IN {_JSON_IN_LIST}"
+_UQC_TIME_PERIOD_IN = f"uqc.time_period IN {_JSON_IN_LIST}"
+
+
+@lru_cache(maxsize=64)
+def _company_intersect_sql(count: int, link_table: str = "company_questions",
+                           with_time_periods: bool = False) -> str:
+    """Condition matching questions linked to every one of ``count`` company ids.
+
+    With ``with_time_periods`` each company must have a link row in one of the
+    selected time periods, bound as a JSON array after each company id.
+    """
+    probe = f"SELECT question_id FROM {link_table} WHERE company_id = ?"
+    if with_time_periods:
+        probe += f" AND time_period IN {_JSON_IN_LIST}"
+    return "q.id IN (" + " INTERSECT ".join([probe] * count) + ")"
+
+
+def _company_intersect_params(company_ids: List[int], time_periods: Optional[List[str]]) -> List[Any]:
+    """Parameters for :func:`_company_intersect_sql`, in placeholder order"""
+    if not time_periods:
+        return list(company_ids)
+    periods = json.dumps(time_periods)
+    return [value for company_id in company_ids for value in (company_id, periods)]
+
+
+@lru_cache(maxsize=64)
+def _topic_filter_sql(count: int, match_all: bool = True, alias: str = "q",
+                      link_table: str = "question_topics", link_column: str = "question_id") -> str:
+    """Indexed EXISTS probe(s) on a topic link table; ``match_all`` requires every topic"""
+    probe = f"EXISTS (SELECT 1 FROM {link_table} qt WHERE qt.{link_column} = {alias}.id AND qt.topic {{}})"
+    if match_all:
+        return " AND ".join([probe.format("= ?")] * count)
+    return probe.format(f"IN {_JSON_IN_LIST}")
+
+
+@lru_cache(maxsize=64)
+def _match_every_sql(count: int, value_condition: str, alias: str = "q",
+                     link_table: str = "company_questions", link_alias: str = "cq",
+                     link_column: str = "question_id") -> str:
+    """One indexed EXISTS probe per required value, so the row must be linked to all of them"""
+    probe = (f"EXISTS (SELECT 1 FROM {link_table} {link_alias} "
+             f"WHERE {link_alias}.{link_column} = {alias}.id AND {value_condition})")
+    return " AND ".join([probe] * count)
+
+
+def _difficulty_orders(difficulty_list: List[str]) -> List[int]:
+    """Translate difficulty filter values to difficulty_order ranks, skipping unknown values"""
+    return [_DIFFICULTY_ORDER[d] for d in difficulty_list if d in _DIFFICULTY_ORDER]
+
+
+# Rank stored in the generated questions.difficulty_order column
+_DIFFICULTY_ORDER = MappingProxyType({
+    DifficultyEnum.EASY.value: 1,
+    DifficultyEnum.MEDIUM.value: 2,
+    DifficultyEnum.HARD.value: 3,
+})
+
+
+# ORDER BY expressions per sort field. Difficulty sorts on the generated
+# difficulty_order column so idx_q_difforder_id can serve the ordering.
+_SORT_FIELD_MAP = MappingProxyType({
+    SortByEnum.FREQUENCY: "MAX(cq.frequency)",
+    SortByEnum.TITLE: "q.title",
+    SortByEnum.DIFFICULTY: "q.difficulty_order",
+})
+
+# Highest frequency over all company rows, kept in sync by triggers
+_PRECOMPUTED_FREQUENCY_SORT = "q.max_frequency"
+
+_SORT_DIRECTION_MAP = MappingProxyType({
+    SortOrderEnum.ASC: "ASC",
+    SortOrderEnum.DESC: "DESC",
+})
+
+# Question columns returned by the listing queries
+_QUESTION_COLUMNS = """q.id, q.title, q.difficulty, q.acceptance_rate, q.link, q.topics,
+                    q.created_at, q.added_by, q.is_approved, q.description, q.solution, q.is_public"""
+
+# User questions shaped like question rows: combined ID (offset 1000000), added_by
+# alias, and the difficulty spelled like DifficultyEnum ('Medium' -> 'MEDIUM')
+_USER_QUESTION_DISPLAY_COLUMNS = """q.id + 1000000 as id, q.title, UPPER(COALESCE(NULLIF(q.difficulty, ''), 'MEDIUM')) as difficulty,
+                    NULL as acceptance_rate, q.link, q.topics, q.description, q.created_by as added_by,
+                    q.is_approved, q.is_public, q.created_at"""
+
+# Fixed query text so each connection's statement cache reuses the compiled plan
+_FIND_ALL_SQL = "SELECT * FROM questions"
+_FIND_BY_ID_SQL = "SELECT * FROM questions WHERE id = ?"
+_ID_BOUNDS_SQL = "SELECT MIN(id) AS min_id, MAX(id) AS max_id, COUNT(*) AS total FROM questions"
+
+# Company data grouped in SQL: one JSON object per question mapping each company to
+# its highest frequency and distinct time periods, highest frequency first
+_COMPANY_DATA_SQL = """
+    SELECT question_id, json_group_object(company_name, json_object(
+        'frequency', frequency, 'time_periods', json(time_periods)
+    )) AS companies
+    FROM (
+        SELECT cq.question_id, c.name AS company_name, MAX(cq.frequency) AS frequency,
+               json_group_array(DISTINCT cq.time_period) AS time_periods
+        FROM company_questions cq
+        JOIN companies c ON cq.company_id = c.id
+        {source}
+        GROUP BY cq.question_id, c.id
+        ORDER BY cq.question_id, frequency DESC
+    )
+    GROUP BY question_id
+"""
+_COMPANY_DATA_FOR_IDS_SQL = _COMPANY_DATA_SQL.format(source=f"WHERE cq.question_id IN {_JSON_IN_LIST}")
+
+# The same company map for one listing row, evaluated per row of an already-limited page
+_PAGE_COMPANIES_SQL = """(
+    SELECT json_group_object(company_name, json_object(
+        'frequency', frequency, 'time_periods', json(time_periods)
+    ))
+    FROM (
+        SELECT c.name AS company_name, MAX(cq.frequency) AS frequency,
+               json_group_array(DISTINCT cq.time_period) AS time_periods
+        FROM company_questions cq
+        JOIN companies c ON cq.company_id = c.id
+        WHERE cq.question_id = page.id
+        GROUP BY c.id
+        ORDER BY frequency DESC
+    )
+) AS companies"""
+
+# Distinct topics, read from the trimmed values the topic link tables already hold.
+# The link columns are NOCASE; BINARY keeps differently-cased topics apart.
+_ALL_TOPICS_SQL = """
+    SELECT topic COLLATE BINARY AS topic FROM question_topics
+    UNION
+    SELECT uqt.topic COLLATE BINARY FROM user_question_topics uqt
+    JOIN user_questions uq ON uq.id = uqt.user_question_id
+    WHERE uq.is_public = 1
+    ORDER BY 1
+"""
+
+# Topics of specific questions, read from the normalized link tables
+_TOPICS_FOR_IDS_SQL = f"""
+    SELECT topic COLLATE BINARY AS topic FROM question_topics
+    WHERE question_id IN {_JSON_IN_LIST}
+    UNION
+    SELECT topic COLLATE BINARY FROM user_question_topics
+    WHERE user_question_id IN {_JSON_IN_LIST}
+"""
+
+# Oversampled id lookups tried before falling back to a reservoir pass
+_RANDOM_SAMPLE_ATTEMPTS = 3
+
+# Dropdown options only change when questions are written; see invalidate_filter_options()
+_filter_options_cache = TTLCache(maxsize=8, ttl=60.0)
+
+
+# Bumped on every question write; caches above the repository put it in their keys,
+# so a write retires their entries without them being cleared one by one
+_question_data_version = 0
+
+
+def invalidate_filter_options() -> None:
+    """Drop cached filter dropdown options and retire versioned caches after a question write"""
+    global _question_data_version
+    _filter_options_cache.invalidate()
+    _question_data_version += 1
+
+
+def question_data_version() -> int:
+    """Counter that changes whenever question data is written"""
+    return _question_data_version
+
+
+# Filter statistics keyed by the filters alone: paging and sorting through the
+# same result set reuses them. Regular questions are loaded offline, so the TTL
+# is what bounds staleness.
+_filter_stats_cache = TTLCache(maxsize=2048, ttl=60.0)
+
+
+def _filter_stats_key(filters: QuestionFilters) -> tuple:
+    """Cache key covering every filter that affects the statistics"""
+    return (
+        tuple(filters.companies), filters.company_logic,
+        tuple(filters.difficulties),
+        tuple(filters.time_periods), filters.time_period_logic,
+        tuple(filters.topics), filters.search,
+    )
+
+
 class QuestionRepository(BaseRepository):
     """Repository for question-related database operations"""
     
     def find_all(self, **kwargs) -> List[Any]:
         """Find all questions"""
-        query = "SELECT * FROM questions"
-        return self.execute_query(query)
+        return self.execute_query(_FIND_ALL_SQL)
     
     def find_by_id(self, id: int) -> Optional[Any]:
         """Find question by ID"""
-        query = "SELECT * FROM questions WHERE id = ?"
-        return self.execute_query_one(query, (id,))
+        return self.execute_query_one(_FIND_BY_ID_SQL, (id,))
+    
+    def _paginate_with_total(self, query: str, params: List[Any], filters: QuestionFilters,
+                             page_columns: str = "") -> Tuple[List[Dict[str, Any]], int]:
+        """Run a query selecting ``COUNT(*) OVER() AS _total`` for one page, returning (rows, total).
+        
+        ``page_columns`` adds select-list expressions over the limited rows (aliased
+        ``page``), so they are evaluated for the returned page only.
+        """
+        offset = (filters.page - 1) * filters.per_page
+        page_query = f"{query}\nLIMIT ? OFFSET ?"
+        if page_columns:
+            # SQLite scans the limited subquery in its ORDER BY order
+            page_query = f"SELECT page.*, {page_columns} FROM ({page_query}) AS page"
+        rows = self.execute_query(page_query, list(params) + [filters.per_page, offset])
+        
+        if rows:
+            total = rows[0]['_total']
+            for row in rows:
+                del row['_total']
+        elif offset:
+            # Past the last page there is no row to carry the window total
+            count_result = self.execute_query_one(f"SELECT COUNT(*) as total FROM ({query}) AS page_count", params)
+            total = count_result['total'] if count_result else 0
+        else:
+            total = 0
+        
+        return rows, total
     
     def get_all_questions_unified(self, filters: QuestionFilters, user_id: Optional[int] = None) -> Tuple[List[Dict[str, Any]], int]:
         """Get all questions (regular + user questions) with unified filtering"""
@@ -31,18 +260,18 @@ class QuestionRepository(BaseRepository):
             
             # Difficulty filtering
             if filters.difficulties:
-                difficulty_list = [x.strip() for x in filters.difficulties.split(',') if x.strip()]
-                if difficulty_list:
-                    placeholders = ','.join(['?' for _ in difficulty_list])
-                    where_conditions.append(f"difficulty IN ({placeholders})")
-                    params.extend(difficulty_list)
-            
-            # Topic filtering
-            if filters.topics:
-                topic_list = [x.strip() for x in filters.topics.split(',') if x.strip()]
-                for topic in topic_list:
-                    where_conditions.append("topics LIKE ?")
-                    params.append(f"%{topic}%")
+                where_conditions.append(_DIFFICULTY_IN)
+                params.append(json.dumps(filters.difficulties))
+            
+            # Topic filtering is pushed into each branch, against that branch's link table
+            question_topic_filter = user_topic_filter = ""
+            topic_list = filters.topics
+            if topic_list:
+                question_topic_filter = "WHERE " + _topic_filter_sql(len(topic_list))
+                user_topic_filter = "AND " + _topic_filter_sql(
+                    len(topic_list), alias="uq",
+                    link_table="user_question_topics", link_column="user_question_id",
+                )
             
             # Search filtering
             if filters.search:
@@ -50,9 +279,12 @@ class QuestionRepository(BaseRepository):
                 params.append(f"%{filters.search}%")
             
             # User visibility conditions
+            # The user id is bound (not interpolated) so the SQL text is the same for every user
             user_condition = ""
+            user_params = []
             if user_id:
-                user_condition = f" OR (source = 'user' AND (is_public = 0 OR created_by = {user_id}))"
+                user_condition = " OR (source = 'user' AND (is_public = 0 OR created_by = ?))"
+                user_params.append(user_id)
             
             base_where = " AND ".join(where_conditions) if where_conditions else "1=1"
             
@@ -79,6 +311,7 @@ class QuestionRepository(BaseRepository):
                     q.id as original_id,
                     NULL as user_question_id
                 FROM questions q
+                {question_topic_filter}
                 
                 UNION ALL
                 
@@ -103,20 +336,18 @@ class QuestionRepository(BaseRepository):
                     uq.id as user_question_id
                 FROM user_questions uq
                 JOIN users u ON uq.created_by = u.id
-                WHERE (uq.is_public = 1 AND uq.is_approved = 1){user_condition}
+                WHERE ((uq.is_public = 1 AND uq.is_approved = 1){user_condition})
+                {user_topic_filter}
             )
-            SELECT * FROM unified_questions 
+            SELECT *, COUNT(*) OVER() AS _total FROM unified_questions 
             WHERE {base_where}
             ORDER BY id DESC
-            LIMIT ? OFFSET ?
             """
             
-            # Add pagination params
-            offset = (filters.page - 1) * filters.per_page
-            query_params = params + [filters.per_page, offset]
-            
-            # Get questions
-            questions = self.execute_query(unified_query, query_params)
+            # Get the page and the total in one round-trip
+            questions, total = self._paginate_with_total(
+                unified_query, topic_list + user_params + topic_list + params, filters
+            )
             
             # Convert boolean fields
             for question in questions:
@@ -124,45 +355,6 @@ class QuestionRepository(BaseRepository):
                     question['is_approved'] = bool(question['is_approved'])
                 if 'is_public' in question:
                     question['is_public'] = bool(question['is_public'])
-        
-            # Count total
-            count_query = f"""
-        WITH unified_questions AS (
-            SELECT 
-                q.id,
-                q.title,
-                q.difficulty,
-                q.acceptance_rate,
-                q.link,
-                q.topics,
-                'regular' as source,
-                1 as is_public,
-                1 as is_approved,
-                NULL as created_by
-            FROM questions q
-            
-            UNION ALL
-            
-            SELECT 
-                1000000 + uq.id as id,
-                uq.title,
-                uq.difficulty,
-                NULL as acceptance_rate,
-                '#' as link,
-                uq.topics,
-                'user' as source,
-                uq.is_public,
-                uq.is_approved,
-                uq.created_by
-            FROM user_questions uq
-            WHERE (uq.is_public = 1 AND uq.is_approved = 1){user_condition}
-        )
-        SELECT COUNT(*) as total FROM unified_questions 
-        WHERE {base_where}
-        """
-            
-            total_result = self.execute_query_one(count_query, params)
-            total = total_result['total'] if total_result else 0
             
             return questions, total
         
@@ -171,49 +363,59 @@ class QuestionRepository(BaseRepository):
             logger.error(f"SQL Query params: {params}")
             raise
     
-    def get_filtered_questions(self, filters: QuestionFilters, user_id: Optional[int] = None) -> Tuple[List[Dict[str, Any]], int]:
-        """Get filtered and paginated questions with total count - original method"""
+    def get_filtered_questions(self, filters: QuestionFilters, user_id: Optional[int] = None,
+                               with_companies: bool = False) -> Tuple[List[Dict[str, Any]], int]:
+        """Get filtered and paginated questions with total count.
+        
+        With ``with_companies`` each row also carries ``companies``, the same
+        {company_name: {frequency, time_periods}} map get_company_data_for_questions
+        returns, fetched in the page query itself.
+        """
         logger.info(f"Repository: Getting filtered questions with filters: {filters}, user_id: {user_id}")
         
         try:
-            # Build WHERE clause
+            # Build WHERE clause; conditions on company_questions rows are kept
+            # apart so they can go either into a join or into an EXISTS
             where_conditions = []
             params = []
+            link_conditions = []
+            link_params = []
             
             # Company filtering
             if filters.companies:
                 logger.debug(f"Applying company filter: {filters.companies}")
-                company_list = [x.strip() for x in filters.companies.split(',') if x.strip()]
-                if company_list:
-                    placeholders = ','.join(['?' for _ in company_list])
-                    where_conditions.append(f"(c.name IN ({placeholders}) OR c.name IS NULL)")
-                    params.extend(company_list)
+                company_ids = company_name_cache.get_ids(filters.companies)
+                link_conditions.append(_CQ_COMPANY_IN_OR_NULL)
+                link_params.append(json.dumps(company_ids))
+                if filters.company_logic == "AND" and len(filters.companies) > 1:
+                    if len(company_ids) < len(filters.companies):
+                        # An unknown company can never be matched
+                        where_conditions.append("0 = 1")
+                    else:
+                        # Questions asked by every company: intersect per-company id lists
+                        where_conditions.append(
+                            _company_intersect_sql(len(company_ids), with_time_periods=bool(filters.time_periods))
+                        )
+                        params.extend(_company_intersect_params(company_ids, filters.time_periods))
             
             # Difficulty filtering
             if filters.difficulties:
                 logger.debug(f"Applying difficulty filter: {filters.difficulties}")
-                difficulty_list = [x.strip() for x in filters.difficulties.split(',') if x.strip()]
-                if difficulty_list:
-                    placeholders = ','.join(['?' for _ in difficulty_list])
-                    where_conditions.append(f"q.difficulty IN ({placeholders})")
-                    params.extend(difficulty_list)
+                difficulty_orders = _difficulty_orders(filters.difficulties)
+                where_conditions.append(_Q_DIFFICULTY_ORDER_IN)
+                params.append(json.dumps(difficulty_orders))
             
             # Time period filtering
             if filters.time_periods:
                 logger.debug(f"Applying time period filter: {filters.time_periods}")
-                time_period_list = [x.strip() for x in filters.time_periods.split(',') if x.strip()]
-                if time_period_list:
-                    placeholders = ','.join(['?' for _ in time_period_list])
-                    where_conditions.append(f"(cq.time_period IN ({placeholders}) OR cq.time_period IS NULL)")
-                    params.extend(time_period_list)
+                link_conditions.append(_CQ_TIME_PERIOD_IN_OR_NULL)
+                link_params.append(json.dumps(filters.time_periods))
             
             # Topic filtering
             if filters.topics:
                 logger.debug(f"Applying topic filter: {filters.topics}")
-                topic_list = [x.strip() for x in filters.topics.split(',') if x.strip()]
-                for topic in topic_list:
-                    where_conditions.append("q.topics LIKE ?")
-                    params.append(f"%{topic}%")
+                where_conditions.append(_topic_filter_sql(len(filters.topics)))
+                params.extend(filters.topics)
             
             # Search filtering
             if filters.search:
@@ -221,106 +423,81 @@ class QuestionRepository(BaseRepository):
                 where_conditions.append("q.title LIKE ?")
                 params.append(f"%{filters.search}%")
                 
-            # Build the WHERE clause
-            where_clause = " AND ".join(where_conditions) if where_conditions else "1=1"
-            logger.debug(f"Where clause: {where_clause}")
-            
-            # Handle AND logic
-            having_conditions = []
-            
-            if filters.companies and filters.company_logic == "AND":
-                company_list = [x.strip() for x in filters.companies.split(',') if x.strip()]
-                if len(company_list) > 1:
-                    having_conditions.append(f"COUNT(DISTINCT c.name) = {len(company_list)}")
-            
+            # Handle AND logic: one EXISTS probe per time period, each restricted
+            # to the selected companies like the joined rows are
             if filters.time_periods and filters.time_period_logic == "AND":
-                time_period_list = [x.strip() for x in filters.time_periods.split(',') if x.strip()]
-                if len(time_period_list) > 1:
-                    having_conditions.append(f"COUNT(DISTINCT cq.time_period) = {len(time_period_list)}")
-            
-            having_clause = f"HAVING {' AND '.join(having_conditions)}" if having_conditions else ""
-            logger.debug(f"Having clause: {having_clause}")
+                if len(filters.time_periods) > 1:
+                    value_condition = "cq.time_period = ?"
+                    if filters.companies:
+                        value_condition += f" AND {_CQ_COMPANY_IN_OR_NULL}"
+                    where_conditions.append(_match_every_sql(len(filters.time_periods), value_condition))
+                    for time_period in filters.time_periods:
+                        params.append(time_period)
+                        if filters.companies:
+                            params.append(json.dumps(company_ids))
             
             # Sort field and order
-            sort_field = {
-                "FREQUENCY": "MAX(cq.frequency)",
-                "TITLE": "q.title",
-                "DIFFICULTY": "CASE q.difficulty WHEN 'EASY' THEN 1 WHEN 'MEDIUM' THEN 2 WHEN 'HARD' THEN 3 END"
-            }.get(filters.sort_by, "MAX(cq.frequency)")
-            
-            sort_direction = "ASC" if filters.sort_order == "ASC" else "DESC"
-            
-            # Main query to get questions
-            query = f"""
-            SELECT DISTINCT 
-                q.id,
-                q.title,
-                q.difficulty,
-                q.acceptance_rate,
-                q.link,
-                q.topics,
-                q.created_at,
-                q.added_by,
-                q.is_approved,
-                q.description,
-                q.solution,
-                q.is_public,
-                COALESCE(MAX(cq.frequency), 0) as max_frequency
-            FROM 
-                questions q
-                LEFT JOIN company_questions cq ON q.id = cq.question_id
-                LEFT JOIN companies c ON cq.company_id = c.id
-            WHERE {where_clause}
-            GROUP BY q.id
-            {having_clause}
-            ORDER BY {sort_field} {sort_direction}, q.id DESC
-            LIMIT ? OFFSET ?
-            """
+            sort_field, sort_direction = (
+                _SORT_FIELD_MAP.get(filters.sort_by, _SORT_FIELD_MAP[SortByEnum.FREQUENCY]),
+                _SORT_DIRECTION_MAP.get(filters.sort_order, "DESC"),
+            )
             
-            # Pagination
-            offset = (filters.page - 1) * filters.per_page
-            query_params = params + [filters.per_page, offset]
+            if filters.sort_by == SortByEnum.FREQUENCY and link_conditions:
+                # Frequency over only the matching company rows aggregates over
+                # company rows, so join them; GROUP BY q.id keeps rows unique
+                where_clause = " AND ".join(where_conditions + link_conditions) or "1=1"
+                query = f"""
+                SELECT 
+                    {_QUESTION_COLUMNS},
+                    COALESCE(MAX(cq.frequency), 0) as max_frequency,
+                    COUNT(*) OVER() AS _total
+                FROM 
+                    questions q
+                    LEFT JOIN company_questions cq ON q.id = cq.question_id
+                WHERE {where_clause}
+                GROUP BY q.id
+                ORDER BY {sort_field} {sort_direction}, q.id DESC
+                """
+            else:
+                # Other sorts only need to know whether a matching company row
+                # exists; questions without company data still match, as with the join.
+                # Unfiltered frequency sorts read the trigger-maintained column.
+                if filters.sort_by == SortByEnum.FREQUENCY:
+                    sort_field = _PRECOMPUTED_FREQUENCY_SORT
+                if link_conditions:
+                    where_conditions.append(f"""(
+                        NOT EXISTS (SELECT 1 FROM company_questions cq WHERE cq.question_id = q.id)
+                        OR EXISTS (
+                            SELECT 1 FROM company_questions cq
+                            WHERE cq.question_id = q.id AND {" AND ".join(link_conditions)}
+                        )
+                    )""")
+                where_clause = " AND ".join(where_conditions) or "1=1"
+                query = f"""
+                SELECT 
+                    {_QUESTION_COLUMNS},
+                    COUNT(*) OVER() AS _total
+                FROM questions q
+                WHERE {where_clause}
+                ORDER BY {sort_field} {sort_direction}, q.id DESC
+                """
             
             logger.debug(f"Executing main query: {query}")
+            query_params = params + link_params
             logger.debug(f"Query params: {query_params}")
             
-            questions = self.execute_query(query, query_params)
-            logger.info(f"Retrieved {len(questions)} questions")
+            # The window total counts result rows, so it matches the page query
+            questions, total = self._paginate_with_total(
+                query, query_params, filters, _PAGE_COMPANIES_SQL if with_companies else ""
+            )
+            logger.info(f"Retrieved {len(questions)} questions, total matching: {total}")
             
             # Convert boolean fields for main questions
             for question in questions:
                 question['is_approved'] = bool(question['is_approved'])
                 question['is_public'] = bool(question['is_public'])
-            
-            # Count total
-            count_query = f"""
-            SELECT COUNT(DISTINCT q.id) as total
-            FROM 
-                questions q
-                JOIN company_questions cq ON q.id = cq.question_id
-                JOIN companies c ON cq.company_id = c.id
-            WHERE {where_clause}
-            """
-            
-            if having_conditions:
-                count_query = f"""
-                SELECT COUNT(*) as total
-                FROM (
-                    SELECT q.id
-                    FROM 
-                        questions q
-                        JOIN company_questions cq ON q.id = cq.question_id
-                        JOIN companies c ON cq.company_id = c.id
-                    WHERE {where_clause}
-                    GROUP BY q.id
-                    {having_clause}
-                ) AS filtered_count
-                """
-            
-            logger.debug(f"Executing count query: {count_query}")
-            total_result = self.execute_query_one(count_query, params)
-            total = total_result['total'] if total_result else 0
-            logger.info(f"Total matching questions: {total}")
+                if with_companies:
+                    question['companies'] = json.loads(question['companies'])
             
             return questions, total
             
@@ -329,31 +506,15 @@ class QuestionRepository(BaseRepository):
             logger.error(f"SQL Query params: {params}")
             raise
     
-    def get_company_data_for_questions(self, question_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
-        """Get company data for specific questions"""
+    def get_company_data_for_questions(self, question_ids: List[int]) -> Dict[int, Dict[str, Dict[str, Any]]]:
+        """Get company data for specific questions as {question_id: {company_name: {frequency, time_periods}}}"""
         if not question_ids:
             return {}
         
-        placeholders = ','.join(['?' for _ in question_ids])
-        query = f"""
-            SELECT cq.question_id, c.name as company_name, cq.frequency, cq.time_period
-            FROM company_questions cq
-            JOIN companies c ON cq.company_id = c.id
-            WHERE cq.question_id IN ({placeholders})
-            ORDER BY cq.frequency DESC
-        """
-        
-        results = self.execute_query(query, question_ids)
+        rows = self.execute_query_iter(_COMPANY_DATA_FOR_IDS_SQL, [json.dumps(question_ids)])
         
-        # Group by question_id
-        company_data = {}
-        for row in results:
-            question_id = row['question_id']
-            if question_id not in company_data:
-                company_data[question_id] = []
-            company_data[question_id].append(row)
-        
-        return company_data
+        # SQLite groups and de-duplicates; each question arrives as one JSON object
+        return {row['question_id']: json.loads(row['companies']) for row in rows}
     
     def _build_base_question_conditions(self, filters: QuestionFilters) -> Tuple[List[str], List[Any]]:
         """Build base WHERE conditions for questions table"""
@@ -362,21 +523,14 @@ class QuestionRepository(BaseRepository):
         
         # Difficulty filtering
         if filters.difficulties:
-            difficulty_list = [x.strip() for x in filters.difficulties.split(',') if x.strip()]
-            if difficulty_list:
-                placeholders = ','.join(['?' for _ in difficulty_list])
-                conditions.append(f"q.difficulty IN ({placeholders})")
-                params.extend(difficulty_list)
+            difficulty_orders = _difficulty_orders(filters.difficulties)
+            conditions.append(_Q_DIFFICULTY_ORDER_IN)
+            params.append(json.dumps(difficulty_orders))
         
         # Topic filtering
         if filters.topics:
-            topic_list = [x.strip() for x in filters.topics.split(',') if x.strip()]
-            topic_conditions = []
-            for topic in topic_list:
-                topic_conditions.append("q.topics LIKE ?")
-                params.append(f"%{topic}%")
-            if topic_conditions:
-                conditions.append("(" + " OR ".join(topic_conditions) + ")")
+            conditions.append(_topic_filter_sql(len(filters.topics), match_all=False))
+            params.append(json.dumps(filters.topics))
         
         # Search filtering
         if filters.search:
@@ -392,93 +546,119 @@ class QuestionRepository(BaseRepository):
         
         # Company filtering
         if filters.companies:
-            company_list = [x.strip() for x in filters.companies.split(',') if x.strip()]
-            if company_list:
-                company_conditions = []
-                for company in company_list:
-                    company_conditions.append("c.name = ?")
-                    params.append(company)
-                
-                # Apply AND/OR logic for multiple companies
-                if company_conditions:
-                    logic_operator = " AND " if filters.company_logic == "AND" else " OR "
-                    conditions.append("(" + logic_operator.join(company_conditions) + ")")
+            company_ids = company_name_cache.get_ids(filters.companies)
+            # Apply AND/OR logic for multiple companies
+            if filters.company_logic == "AND" and len(filters.companies) > 1:
+                if len(company_ids) < len(filters.companies):
+                    conditions.append("0 = 1")
+                else:
+                    conditions.append(_company_intersect_sql(
+                        len(company_ids), 'question_companies', with_time_periods=bool(filters.time_periods)
+                    ))
+                    params.extend(_company_intersect_params(company_ids, filters.time_periods))
+            else:
+                conditions.append(_QC_COMPANY_IN)
+                params.append(json.dumps(company_ids))
         
         # Time period filtering
         if filters.time_periods:
-            time_period_list = [x.strip() for x in filters.time_periods.split(',') if x.strip()]
-            if time_period_list:
-                time_period_conditions = []
-                for period in time_period_list:
-                    time_period_conditions.append("qc.time_period = ?")
-                    params.append(period)
-                
-                # Apply AND/OR logic for time periods
-                if time_period_conditions:
-                    logic_operator = " AND " if filters.time_period_logic == "AND" else " OR "
-                    conditions.append("(" + logic_operator.join(time_period_conditions) + ")")
+            # Apply AND/OR logic for time periods
+            logic_operator = " AND " if filters.time_period_logic == "AND" else " OR "
+            conditions.append("(" + logic_operator.join(["qc.time_period = ?"] * len(filters.time_periods)) + ")")
+            params.extend(filters.time_periods)
         
         return conditions, params
         
-    def get_random_questions(self, filters: QuestionFilters, count: int, user_id: Optional[int] = None) -> Tuple[List[Dict[str, Any]], int]:
-        """Get random questions based on filters"""
+    def _sample_ids(self, id_query: str, params: List[Any], count: int) -> Tuple[List[int], int]:
+        """Reservoir-sample ``count`` ids from a query selecting ``id``, returning (ids, rows seen)"""
+        sample: List[int] = []
+        seen = 0
+        for row in self.execute_query_iter(id_query, params):
+            seen += 1
+            if len(sample) < count:
+                sample.append(row['id'])
+            else:
+                slot = random.randrange(seen)
+                if slot < count:
+                    sample[slot] = row['id']
+        return sample, seen
+    
+    def _fetch_by_ids(self, select_fields: str, table: str, ids: List[int], limit: int) -> List[Dict[str, Any]]:
+        """Fetch rows by primary key and return up to ``limit`` of them, picked at random"""
+        if not ids:
+            return []
+        # No SQL LIMIT: SQLite walks the id list in ascending order, so it would
+        # always keep the smallest ids of an oversampled batch
+        query = f"SELECT {select_fields} FROM {table} q WHERE q.id IN {_JSON_IN_LIST}"
+        rows = self.execute_query(query, [json.dumps(ids)])
+        return random.sample(rows, min(limit, len(rows)))
+    
+    def _get_random_unfiltered_questions(self, select_fields: str, count: int) -> Tuple[List[Dict[str, Any]], int]:
+        """Sample random question ids from the id range instead of sorting the table by RANDOM()"""
+        bounds = self.execute_query_one(_ID_BOUNDS_SQL)
+        total = bounds['total'] if bounds else 0
+        if not total:
+            return [], 0
+        
+        id_span = range(bounds['min_id'], bounds['max_id'] + 1)
+        # Oversample in proportion to how sparse the id range is
+        oversample = max(2, -(-len(id_span) // total))
+        questions: Dict[int, Dict[str, Any]] = {}
+        tried = set()
+        
+        for _ in range(_RANDOM_SAMPLE_ATTEMPTS):
+            needed = min(count, total) - len(questions)
+            if needed <= 0 or len(tried) >= len(id_span):
+                break
+            batch = [i for i in random.sample(id_span, min(len(id_span), needed * oversample)) if i not in tried]
+            tried.update(batch)
+            for row in self._fetch_by_ids(select_fields, "questions", batch, needed):
+                questions[row['id']] = row
+        
+        if len(questions) < min(count, total):
+            # Too many gaps in the id range - fall back to a full reservoir pass
+            ids, total = self._sample_ids("SELECT q.id FROM questions q", [], count)
+            return self._fetch_by_ids(select_fields, "questions", ids, count), total
+        
+        # Later attempts append in batch order, so mix the attempts together
+        sample = list(questions.values())
+        random.shuffle(sample)
+        return sample, total
+    
+    def get_random_questions(
+        self, filters: QuestionFilters, count: int, user_id: Optional[int] = None
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], int]:
+        """Get random questions based on filters.
+        
+        Returns regular questions and user questions as separate lists, plus the
+        combined total.
+        """
         logger.info(f"Getting random questions with count: {count}, filters: {filters}, user_id: {user_id}")
         
-        # Build the query parts similar to get_filtered_questions but with random ordering
         base_conditions, base_params = self._build_base_question_conditions(filters)
         company_conditions, company_params = self._build_company_conditions(filters)
         
-        # Main selection query
-        select_query = """
-            SELECT 
+        select_fields = """
                 q.id, q.title, q.difficulty, q.acceptance_rate, q.link, q.topics, 
                 q.description, q.added_by, q.is_approved, q.is_public
-            FROM 
-                questions q
         """
         
-        # Add company join if needed
-        if company_conditions:
-            select_query += """
-                INNER JOIN question_companies qc ON q.id = qc.question_id
-                INNER JOIN companies c ON qc.company_id = c.id
-            """
-        
-        # Add WHERE clause
-        where_clauses = []
-        params = []
-        
-        # Add base conditions
-        if base_conditions:
-            where_clauses.extend(base_conditions)
-            params.extend(base_params)
-        
-        # Add company conditions
-        if company_conditions:
-            where_clauses.extend(company_conditions)
-            params.extend(company_params)
-        
-        # Combine all conditions
-        if where_clauses:
-            select_query += " WHERE " + " AND ".join(where_clauses)
-        
-        # Add GROUP BY if we're using company joins
-        if company_conditions:
-            select_query += " GROUP BY q.id"
-        
-        # Get total count before applying limit/random
-        count_query = f"SELECT COUNT(*) FROM ({select_query}) as filtered_questions"
-        
         try:
-            total_row = self.execute_query_one(count_query, params)
-            total = total_row['COUNT(*)'] if total_row else 0
-            
-            # Add random ordering and limit
-            select_query += " ORDER BY RANDOM() LIMIT ?"
-            params.append(count)
-            
-            # Execute the main query
-            questions = self.execute_query(select_query, params)
+            if not base_conditions and not company_conditions:
+                questions, total = self._get_random_unfiltered_questions(select_fields, count)
+            else:
+                # Id-only query mirroring the filters; the ids are sampled in Python
+                id_query = "SELECT q.id FROM questions q"
+                if company_conditions:
+                    id_query += """
+                        INNER JOIN question_companies qc ON q.id = qc.question_id
+                    """
+                id_query += " WHERE " + " AND ".join(base_conditions + company_conditions)
+                if company_conditions:
+                    id_query += " GROUP BY q.id"
+                
+                ids, total = self._sample_ids(id_query, base_params + company_params, count)
+                questions = self._fetch_by_ids(select_fields, "questions", ids, count)
             
             # Include user questions if logged in
             user_questions = []
@@ -487,8 +667,7 @@ class QuestionRepository(BaseRepository):
             if user_id is not None:
                 user_questions, user_questions_total = self._get_random_user_questions(filters, count, user_id)
             
-            # Return combined results
-            return list(questions) + user_questions, total + user_questions_total
+            return questions, user_questions, total + user_questions_total
             
         except Exception as e:
             logger.error(f"Error getting random questions: {str(e)}")
@@ -496,14 +675,7 @@ class QuestionRepository(BaseRepository):
     
     def _get_random_user_questions(self, filters: QuestionFilters, count: int, user_id: int) -> Tuple[List[Dict[str, Any]], int]:
         """Helper method to get random user questions"""
-        select_fields = """
-            q.id, q.title, q.difficulty, NULL as acceptance_rate, q.link, q.topics, 
-            q.description, q.created_by, q.is_approved, q.is_public, q.created_at
-        """
-        
-        from_clause = """
-            FROM user_questions q
-        """
+        select_fields = _USER_QUESTION_DISPLAY_COLUMNS
         
         # Build where conditions
         where_conditions = []
@@ -515,20 +687,16 @@ class QuestionRepository(BaseRepository):
         
         # Add difficulty filter
         if filters.difficulties:
-            difficulty_list = [x.strip() for x in filters.difficulties.split(',') if x.strip()]
-            if difficulty_list:
-                placeholders = ','.join(['?' for _ in difficulty_list])
-                where_conditions.append(f"q.difficulty IN ({placeholders})")
-                params.extend(difficulty_list)
+            where_conditions.append(_Q_DIFFICULTY_IN)
+            params.append(json.dumps(filters.difficulties))
         
         # Add topic filter
         if filters.topics:
-            topic_list = [x.strip() for x in filters.topics.split(',') if x.strip()]
-            topic_conditions = []
-            for topic in topic_list:
-                topic_conditions.append("q.topics LIKE ?")
-                params.append(f"%{topic}%")
-            where_conditions.append("(" + " OR ".join(topic_conditions) + ")")
+            where_conditions.append(_topic_filter_sql(
+                len(filters.topics), match_all=False,
+                link_table="user_question_topics", link_column="user_question_id",
+            ))
+            params.append(json.dumps(filters.topics))
         
         # Add search filter
         if filters.search:
@@ -538,20 +706,11 @@ class QuestionRepository(BaseRepository):
         # Combine conditions
         where_clause = " WHERE " + " AND ".join(where_conditions) if where_conditions else ""
         
-        # Get total count
-        count_query = f"SELECT COUNT(*) FROM user_questions q {where_clause}"
-        
         try:
-            total_row = self.execute_query_one(count_query, params)
-            total = total_row['COUNT(*)'] if total_row else 0
-            
-            # Build final query with random order and limit
-            query = f"SELECT {select_fields} {from_clause} {where_clause} ORDER BY RANDOM() LIMIT ?"
-            params.append(count)
-            
-            # Execute query
-            user_questions = self.execute_query(query, params)
-            return list(user_questions), total
+            # One pass over the matching ids gives both the total and the sample
+            ids, total = self._sample_ids(f"SELECT q.id FROM user_questions q {where_clause}", params, count)
+            user_questions = self._fetch_by_ids(select_fields, "user_questions", ids, count)
+            return user_questions, total
             
         except Exception as e:
             logger.error(f"Error getting random user questions: {str(e)}")
@@ -564,19 +723,12 @@ class QuestionRepository(BaseRepository):
         logger.info(f"Getting filtered user questions for display with user_id: {user_id}")
         
         try:
-            select_fields = """
-                q.id + 1000000 as id, q.title, q.difficulty, NULL as acceptance_rate, q.link, q.topics, 
-                q.description, q.created_by as added_by, q.is_approved, q.is_public, q.created_at
-            """
-            
-            from_clause = """
-                FROM user_questions q
-                LEFT JOIN user_question_companies uqc ON q.id = uqc.user_question_id
-                LEFT JOIN companies c ON uqc.company_id = c.id
-            """
+            select_fields = _USER_QUESTION_DISPLAY_COLUMNS
             
             where_conditions = []
             params = []
+            link_conditions = []
+            link_params = []
             
             # Visibility rules: show public questions or own questions
             if user_id:
@@ -587,96 +739,74 @@ class QuestionRepository(BaseRepository):
             
             # Apply filters
             if filters.companies:
-                company_list = [x.strip() for x in filters.companies.split(',') if x.strip()]
-                if company_list:
-                    placeholders = ','.join(['?' for _ in company_list])
-                    where_conditions.append(f"c.name IN ({placeholders})")
-                    params.extend(company_list)
+                company_ids = company_name_cache.get_ids(filters.companies)
+                link_conditions.append(_UQC_COMPANY_IN)
+                link_params.append(json.dumps(company_ids))
             
             if filters.difficulties:
-                difficulty_list = [x.strip() for x in filters.difficulties.split(',') if x.strip()]
-                if difficulty_list:
-                    placeholders = ','.join(['?' for _ in difficulty_list])
-                    where_conditions.append(f"q.difficulty IN ({placeholders})")
-                    params.extend(difficulty_list)
+                where_conditions.append(_Q_DIFFICULTY_IN)
+                params.append(json.dumps(filters.difficulties))
             
             if filters.time_periods:
-                time_period_list = [x.strip() for x in filters.time_periods.split(',') if x.strip()]
-                if time_period_list:
-                    placeholders = ','.join(['?' for _ in time_period_list])
-                    where_conditions.append(f"uqc.time_period IN ({placeholders})")
-                    params.extend(time_period_list)
+                link_conditions.append(_UQC_TIME_PERIOD_IN)
+                link_params.append(json.dumps(filters.time_periods))
             
             if filters.topics:
-                topic_list = [x.strip() for x in filters.topics.split(',') if x.strip()]
-                for topic in topic_list:
-                    where_conditions.append("q.topics LIKE ?")
-                    params.append(f"%{topic}%")
+                where_conditions.append(_topic_filter_sql(
+                    len(filters.topics), link_table="user_question_topics", link_column="user_question_id",
+                ))
+                params.extend(filters.topics)
             
             if filters.search:
                 where_conditions.append("q.title LIKE ?")
                 params.append(f"%{filters.search}%")
             
-            where_clause = " AND ".join(where_conditions) if where_conditions else "1=1"
-            
-            # Handle AND logic for companies and time periods
-            having_conditions = []
+            # Handle AND logic for companies and time periods: one EXISTS probe per
+            # required value, each restricted by the other filter's values
+            match_every = {"link_table": "user_question_companies", "link_alias": "uqc",
+                           "link_column": "user_question_id"}
             
             if filters.companies and filters.company_logic == "AND":
-                company_list = [x.strip() for x in filters.companies.split(',') if x.strip()]
-                if len(company_list) > 1:
-                    having_conditions.append(f"COUNT(DISTINCT c.name) = {len(company_list)}")
+                if len(filters.companies) > 1:
+                    if len(company_ids) < len(filters.companies):
+                        # An unknown company can never be matched
+                        where_conditions.append("0 = 1")
+                    else:
+                        value_condition = "uqc.company_id = ?"
+                        if filters.time_periods:
+                            value_condition += f" AND {_UQC_TIME_PERIOD_IN}"
+                        where_conditions.append(_match_every_sql(len(company_ids), value_condition, **match_every))
+                        for company_id in company_ids:
+                            params.append(company_id)
+                            if filters.time_periods:
+                                params.append(json.dumps(filters.time_periods))
             
             if filters.time_periods and filters.time_period_logic == "AND":
-                time_period_list = [x.strip() for x in filters.time_periods.split(',') if x.strip()]
-                if len(time_period_list) > 1:
-                    having_conditions.append(f"COUNT(DISTINCT uqc.time_period) = {len(time_period_list)}")
-            
-            having_clause = f"HAVING {' AND '.join(having_conditions)}" if having_conditions else ""
-            
-            # Build the main query
-            if having_clause:
-                query = f"""
-                    SELECT DISTINCT {select_fields.strip()}
-                    {from_clause.strip()}
-                    WHERE {where_clause}
-                    GROUP BY q.id, q.title, q.difficulty, q.link, q.topics, q.description, q.created_by, q.is_approved, q.is_public, q.created_at
-                    {having_clause}
-                    ORDER BY q.created_at DESC
-                    LIMIT ? OFFSET ?
-                """
-            else:
-                query = f"""
-                    SELECT DISTINCT {select_fields.strip()}
-                    {from_clause.strip()}
-                    WHERE {where_clause}
-                    ORDER BY q.created_at DESC
-                    LIMIT ? OFFSET ?
-                """
-            
-            # Add pagination parameters
-            params.extend([filters.per_page, (filters.page - 1) * filters.per_page])
-            
-            user_questions = self.execute_query(query, params)
-            
-            # Get total count
-            count_query = f"""
-                SELECT COUNT(DISTINCT q.id) as total
+                if len(filters.time_periods) > 1:
+                    value_condition = "uqc.time_period = ?"
+                    if filters.companies:
+                        value_condition += f" AND {_UQC_COMPANY_IN}"
+                    where_conditions.append(_match_every_sql(len(filters.time_periods), value_condition, **match_every))
+                    for time_period in filters.time_periods:
+                        params.append(time_period)
+                        if filters.companies:
+                            params.append(json.dumps(company_ids))
+            
+            # A semi-join is enough: no duplicate rows to group away
+            if link_conditions:
+                where_conditions.append(f"""EXISTS (
+                    SELECT 1 FROM user_question_companies uqc
+                    WHERE uqc.user_question_id = q.id AND {" AND ".join(link_conditions)}
+                )""")
+            where_clause = " AND ".join(where_conditions)
+            query = f"""
+                SELECT {select_fields.strip()}, COUNT(*) OVER() AS _total
                 FROM user_questions q
-                LEFT JOIN user_question_companies uqc ON q.id = uqc.user_question_id
-                LEFT JOIN companies c ON uqc.company_id = c.id
                 WHERE {where_clause}
+                ORDER BY q.created_at DESC, q.id DESC
             """
             
-            # Remove pagination params for count query
-            count_params = params[:-2]
-            if having_clause:
-                count_query += f" GROUP BY q.id {having_clause}"
-                count_result = self.execute_query(count_query, count_params)
-                total = len(count_result)
-            else:
-                count_result = self.execute_query_one(count_query, count_params)
-                total = count_result['total'] if count_result else 0
+            user_questions, total = self._paginate_with_total(query, params + link_params, filters)
             
             logger.debug(f"Retrieved {len(user_questions)} user questions out of {total} total")
             return user_questions, total
@@ -687,37 +817,43 @@ class QuestionRepository(BaseRepository):
     
     def get_filter_stats(self, filters: QuestionFilters) -> Dict[str, Any]:
         """Get statistics for current filters"""
+        return _filter_stats_cache.get_or_set(
+            _filter_stats_key(filters),
+            lambda: self._compute_filter_stats(filters),
+        )
+    
+    def _compute_filter_stats(self, filters: QuestionFilters) -> Dict[str, Any]:
+        """Run the statistics queries behind get_filter_stats"""
         # Use same filtering logic as get_filtered_questions but without pagination
         where_conditions = []
         params = []
         
         # Apply same filters as in get_filtered_questions
         if filters.companies:
-            company_list = [x.strip() for x in filters.companies.split(',') if x.strip()]
-            if company_list:
-                placeholders = ','.join(['?' for _ in company_list])
-                where_conditions.append(f"c.name IN ({placeholders})")
-                params.extend(company_list)
+            company_ids = company_name_cache.get_ids(filters.companies)
+            where_conditions.append(_CQ_COMPANY_IN)
+            params.append(json.dumps(company_ids))
+            if filters.company_logic == "AND" and len(filters.companies) > 1:
+                if len(company_ids) < len(filters.companies):
+                    where_conditions.append("0 = 1")
+                else:
+                    where_conditions.append(
+                        _company_intersect_sql(len(company_ids), with_time_periods=bool(filters.time_periods))
+                    )
+                    params.extend(_company_intersect_params(company_ids, filters.time_periods))
         
         if filters.difficulties:
-            difficulty_list = [x.strip() for x in filters.difficulties.split(',') if x.strip()]
-            if difficulty_list:
-                placeholders = ','.join(['?' for _ in difficulty_list])
-                where_conditions.append(f"q.difficulty IN ({placeholders})")
-                params.extend(difficulty_list)
+            difficulty_orders = _difficulty_orders(filters.difficulties)
+            where_conditions.append(_Q_DIFFICULTY_ORDER_IN)
+            params.append(json.dumps(difficulty_orders))
         
         if filters.time_periods:
-            time_period_list = [x.strip() for x in filters.time_periods.split(',') if x.strip()]
-            if time_period_list:
-                placeholders = ','.join(['?' for _ in time_period_list])
-                where_conditions.append(f"cq.time_period IN ({placeholders})")
-                params.extend(time_period_list)
+            where_conditions.append(_CQ_TIME_PERIOD_IN)
+            params.append(json.dumps(filters.time_periods))
         
         if filters.topics:
-            topic_list = [x.strip() for x in filters.topics.split(',') if x.strip()]
-            for topic in topic_list:
-                where_conditions.append("q.topics LIKE ?")
-                params.append(f"%{topic}%")
+            where_conditions.append(_topic_filter_sql(len(filters.topics)))
+            params.extend(filters.topics)
         
         if filters.search:
             where_conditions.append("q.title LIKE ?")
@@ -725,128 +861,88 @@ class QuestionRepository(BaseRepository):
         
         where_clause = " AND ".join(where_conditions) if where_conditions else "1=1"
         
-        # Handle AND logic
-        having_conditions = []
-        
-        if filters.companies and filters.company_logic == "AND":
-            company_list = [x.strip() for x in filters.companies.split(',') if x.strip()]
-            if len(company_list) > 1:
-                having_conditions.append(f"COUNT(DISTINCT c.name) = {len(company_list)}")
+        # Handle AND logic: probe each time period from the matched questions, so
+        # the other statistics still cover every filtered row
+        match_conditions = []
+        match_params = []
         
         if filters.time_periods and filters.time_period_logic == "AND":
-            time_period_list = [x.strip() for x in filters.time_periods.split(',') if x.strip()]
-            if len(time_period_list) > 1:
-                having_conditions.append(f"COUNT(DISTINCT cq.time_period) = {len(time_period_list)}")
-        
-        having_clause = f"HAVING {' AND '.join(having_conditions)}" if having_conditions else ""
-        
-        if having_clause:
-            stats_query = f"""
-                SELECT 
+            if len(filters.time_periods) > 1:
+                value_condition = "cq.time_period = ?"
+                if filters.companies:
+                    value_condition += f" AND {_CQ_COMPANY_IN}"
+                match_conditions.append(_match_every_sql(len(filters.time_periods), value_condition, alias="filt"))
+                for time_period in filters.time_periods:
+                    match_params.append(time_period)
+                    if filters.companies:
+                        match_params.append(json.dumps(company_ids))
+        
+        match_clause = f"WHERE {' AND '.join(match_conditions)}" if match_conditions else ""
+        
+        # One pass over the filtered join feeds every statistic
+        stats_query = f"""
+            WITH filt AS MATERIALIZED (
+                SELECT q.id, q.difficulty, cq.company_id, cq.time_period
+                FROM questions q
+                JOIN company_questions cq ON q.id = cq.question_id
+                WHERE {where_clause}
+            ),
+            matched AS (
+                SELECT id, difficulty
+                FROM filt
+                {match_clause}
+                GROUP BY id
+            )
+            SELECT
+                s.total_questions,
+                s.easy_count,
+                s.medium_count,
+                s.hard_count,
+                (SELECT COUNT(DISTINCT company_id) FROM filt) as companies_count,
+                (SELECT json_group_array(time_period) FROM (
+                    SELECT DISTINCT time_period FROM filt
+                    WHERE time_period IS NOT NULL ORDER BY time_period
+                )) as time_periods,
+                (SELECT json_group_array(topic) FROM (
+                    SELECT DISTINCT topic COLLATE BINARY AS topic FROM question_topics
+                    WHERE question_id IN (SELECT id FROM filt) ORDER BY 1
+                )) as topics
+            FROM (
+                SELECT
                     COUNT(*) as total_questions,
-                    SUM(CASE WHEN filtered_questions.difficulty = 'EASY' THEN 1 ELSE 0 END) as easy_count,
-                    SUM(CASE WHEN filtered_questions.difficulty = 'MEDIUM' THEN 1 ELSE 0 END) as medium_count,
-                    SUM(CASE WHEN filtered_questions.difficulty = 'HARD' THEN 1 ELSE 0 END) as hard_count
-                FROM (
-                    SELECT DISTINCT q.id, q.difficulty
-                    FROM questions q
-                    JOIN company_questions cq ON q.id = cq.question_id
-                    JOIN companies c ON cq.company_id = c.id
-                    WHERE {where_clause}
-                    GROUP BY q.id, q.difficulty
-                    {having_clause}
-                ) AS filtered_questions
-            """
-        else:
-            stats_query = f"""
-                SELECT 
-                    COUNT(DISTINCT id) as total_questions,
-                    SUM(CASE WHEN difficulty = 'EASY' THEN 1 ELSE 0 END) as easy_count,
-                    SUM(CASE WHEN difficulty = 'MEDIUM' THEN 1 ELSE 0 END) as medium_count,
-                    SUM(CASE WHEN difficulty = 'HARD' THEN 1 ELSE 0 END) as hard_count
-                FROM (
-                    SELECT DISTINCT q.id, q.difficulty
-                    FROM questions q
-                    JOIN company_questions cq ON q.id = cq.question_id
-                    JOIN companies c ON cq.company_id = c.id
-                    WHERE {where_clause}
-                ) AS unique_questions
-            """
-        
-        stats = self.execute_query_one(stats_query, params)
-        
-        # Get companies count
-        companies_query = f"""
-            SELECT COUNT(DISTINCT c.name) as companies_count
-            FROM questions q
-            JOIN company_questions cq ON q.id = cq.question_id
-            JOIN companies c ON cq.company_id = c.id
-            WHERE {where_clause}
-        """
-        
-        companies_result = self.execute_query_one(companies_query, params)
-        
-        # Get unique time periods
-        time_periods_query = f"""
-            SELECT DISTINCT cq.time_period
-            FROM questions q
-            JOIN company_questions cq ON q.id = cq.question_id
-            JOIN companies c ON cq.company_id = c.id
-            WHERE {where_clause}
-            ORDER BY cq.time_period
+                    SUM(difficulty = 'EASY') as easy_count,
+                    SUM(difficulty = 'MEDIUM') as medium_count,
+                    SUM(difficulty = 'HARD') as hard_count
+                FROM matched
+            ) AS s
         """
         
-        time_periods_results = self.execute_query(time_periods_query, params)
-        unique_time_periods = [row['time_period'] for row in time_periods_results]
-        
-        # Get unique topics
-        topics_query = f"""
-            SELECT DISTINCT q.topics
-            FROM questions q
-            JOIN company_questions cq ON q.id = cq.question_id
-            JOIN companies c ON cq.company_id = c.id
-            WHERE {where_clause} AND q.topics IS NOT NULL AND q.topics != ''
-        """
-        
-        topics_results = self.execute_query(topics_query, params)
-        topics_set = set()
-        for row in topics_results:
-            if row['topics']:
-                topic_list = [topic.strip() for topic in row['topics'].split(',')]
-                topics_set.update(topic_list)
+        stats = self.execute_query_one(stats_query, params + match_params)
         
         return {
             'total_questions': stats['total_questions'] or 0,
             'easy_count': stats['easy_count'] or 0,
             'medium_count': stats['medium_count'] or 0,
             'hard_count': stats['hard_count'] or 0,
-            'companies_count': companies_result['companies_count'] or 0,
-            'time_periods': unique_time_periods,
-            'topics': sorted(list(topics_set))
+            'companies_count': stats['companies_count'] or 0,
+            'time_periods': json.loads(stats['time_periods']),
+            'topics': json.loads(stats['topics'])
         }
     
-    def get_all_topics(self) -> List[str]:
-        """Get all unique topics from questions"""
+    def get_topics_for_questions(self, question_ids: List[int], user_question_ids: List[int]) -> List[str]:
+        """Distinct topics of the given questions and user questions (original user_questions IDs)"""
+        if not question_ids and not user_question_ids:
+            return []
+        rows = self.execute_query_iter(_TOPICS_FOR_IDS_SQL, [json.dumps(question_ids), json.dumps(user_question_ids)])
+        return [row['topic'] for row in rows]
+    
+    def get_all_topics(self) -> Sequence[str]:
+        """Get all unique topics from questions and public user questions (shared; do not mutate)"""
         try:
-            query = """
-                SELECT DISTINCT topics
-                FROM questions
-                WHERE topics IS NOT NULL AND topics != ''
-                UNION
-                SELECT DISTINCT topics
-                FROM user_questions
-                WHERE topics IS NOT NULL AND topics != '' AND is_public = 1
-            """
-            
-            results = self.execute_query(query)
-            topics_set = set()
-            
-            for row in results:
-                if row['topics']:
-                    topic_list = [topic.strip() for topic in row['topics'].split(',') if topic.strip()]
-                    topics_set.update(topic_list)
-            
-            return sorted(list(topics_set))
+            return _filter_options_cache.get_or_set(
+                "topics",
+                lambda: tuple(row['topic'] for row in self.execute_query_iter(_ALL_TOPICS_SQL)),
+            )
         except Exception as e:
             logger.error(f"Error getting all topics: {str(e)}")
             raise
@@ -1,11 +1,14 @@
 """
 Repository for user question management and related operations
 """
-import sqlite3
 import json
+from collections import defaultdict
 from datetime import datetime
+from functools import lru_cache
 from typing import List, Optional, Tuple, Dict, Any
-from app.config.database import get_db_connection
+from app.utils.database import db_manager
+from app.repositories.question_repository import invalidate_filter_options
+from app.repositories.user_repository import get_usernames
 from app.models.user_models import (
     UserQuestion, QuestionReference, UserQuestionCompany, 
     ApprovalRequest, UserFavorite, QuestionDifficulty, 
@@ -13,39 +16,63 @@ from app.models.user_models import (
 )
 
 
+# Stored difficulty text -> enum member; a dict lookup skips the Enum call machinery
+_DIFFICULTY_BY_VALUE = {difficulty.value: difficulty for difficulty in QuestionDifficulty}
+
+
+
+@lru_cache(maxsize=64)
+def _update_user_question_sql(fields: Tuple[str, ...]) -> str:
+    """UPDATE statement for one sorted set of fields; stable text keeps sqlite3's statement cache warm"""
+    assignments = ", ".join(f"{field} = ?" for field in fields)
+    return f"UPDATE user_questions SET {assignments}, updated_at = CURRENT_TIMESTAMP WHERE id = ? RETURNING *"
+
+
+@lru_cache(maxsize=1024)
+def _parse_topics(topics_json: str) -> Tuple[str, ...]:
+    """Parse a stored topics JSON array once per distinct value; pages repeat the same few sets"""
+    return tuple(json.loads(topics_json))
+
+
+def _dict_rows(cursor) -> List[Dict[str, Any]]:
+    """Read the remaining rows as plain dicts, zipping tuples with the column names once"""
+    cursor.row_factory = None
+    columns = [column[0] for column in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor]
+
+
 class UserQuestionRepository:
     
     def create_user_question(self, title: str, created_by: int, difficulty: QuestionDifficulty,
                             description: Optional[str] = None, topics: Optional[List[str]] = None,
                             solution: Optional[str] = None, link: Optional[str] = None) -> UserQuestion:
         """Create a new user question"""
-        with get_db_connection() as conn:
+        with db_manager.get_connection() as conn:
             cursor = conn.cursor()
             
             topics_json = json.dumps(topics) if topics else None
             
+            # RETURNING hands back the stored row, so no follow-up SELECT is needed
             cursor.execute("""
                 INSERT INTO user_questions (title, description, difficulty, topics, solution, link, created_by)
                 VALUES (?, ?, ?, ?, ?, ?, ?)
+                RETURNING *
             """, (title, description, difficulty.value, topics_json, solution, link, created_by))
             
-            question_id = cursor.lastrowid
+            row = cursor.fetchone()
             conn.commit()
+            invalidate_filter_options()
             
-            return self.get_user_question_by_id(question_id)
+            return self._row_to_user_question(row)
     
     def get_user_question_by_id(self, question_id: int, user_id: Optional[int] = None) -> Optional[UserQuestion]:
         """Get user question by ID"""
-        with get_db_connection() as conn:
+        with db_manager.get_connection() as conn:
             cursor = conn.cursor()
             
             cursor.execute("""
-                SELECT uq.*, u.username as creator_username,
-                       au.username as approver_username,
-                       CASE WHEN uf.id IS NOT NULL THEN 1 ELSE 0 END as is_favorited
+                SELECT uq.*, CASE WHEN uf.id IS NOT NULL THEN 1 ELSE 0 END as is_favorited
                 FROM user_questions uq
-                JOIN users u ON uq.created_by = u.id
-                LEFT JOIN users au ON uq.approved_by = au.id
                 LEFT JOIN user_favorites uf ON uf.user_question_id = uq.id AND uf.user_id = ?
                 WHERE uq.id = ?
             """, (user_id, question_id))
@@ -54,13 +81,17 @@ class UserQuestionRepository:
             if not row:
                 return None
             
-            return self._row_to_user_question(row)
+            question = self._row_to_user_question(row)
+            question.is_favorited = bool(row['is_favorited'])
+            return question
     
     def get_user_questions(self, user_id: Optional[int] = None, is_public_only: bool = False,
                           is_approved_only: bool = False, created_by: Optional[int] = None,
-                          page: int = 1, per_page: int = 20) -> Tuple[List[UserQuestion], int]:
-        """Get user questions with filtering"""
-        with get_db_connection() as conn:
+                          page: int = 1, per_page: int = 20,
+                          after: Optional[Tuple[str, int]] = None
+                          ) -> Tuple[List[UserQuestion], Optional[int], Optional[Tuple[str, int]]]:
+        """Get user questions with filtering, plus the (created_at, id) cursor of the next page (no total for cursor requests)"""
+        with db_manager.get_connection() as conn:
             cursor = conn.cursor()
             
             conditions = []
@@ -78,128 +109,149 @@ class UserQuestionRepository:
             
             where_clause = " AND ".join(conditions) if conditions else "1=1"
             
-            # Get total count
-            cursor.execute(f"""
-                SELECT COUNT(*) FROM user_questions uq WHERE {where_clause}
-            """, params)
-            total = cursor.fetchone()[0]
+            # Keyset pagination resumes right after the last row of the previous
+            # page via idx_uq_created*; OFFSET paging is kept for old clients.
+            # Scrolling clients don't need the total, so only page requests count,
+            # with a window over the page query rather than a separate COUNT.
+            if after:
+                total_column = ""
+                where_clause += " AND (uq.created_at, uq.id) < (?, ?)"
+                params.extend(after)
+                offset = 0
+            else:
+                total_column = ", COUNT(*) OVER() AS _total"
+                offset = (page - 1) * per_page
             
-            # Get questions with pagination
-            offset = (page - 1) * per_page
             cursor.execute(f"""
-                SELECT uq.*, u.username as creator_username,
-                       au.username as approver_username,
-                       CASE WHEN uf.id IS NOT NULL THEN 1 ELSE 0 END as is_favorited
+                SELECT uq.*{total_column}
                 FROM user_questions uq
-                JOIN users u ON uq.created_by = u.id
-                LEFT JOIN users au ON uq.approved_by = au.id
-                LEFT JOIN user_favorites uf ON uf.user_question_id = uq.id AND uf.user_id = ?
                 WHERE {where_clause}
-                ORDER BY uq.created_at DESC
+                ORDER BY uq.created_at DESC, uq.id DESC
                 LIMIT ? OFFSET ?
-            """, [user_id] + params + [per_page, offset])
+            """, params + [per_page + 1, offset])
             
-            questions = [self._row_to_user_question(row) for row in cursor.fetchall()]
-            return questions, total
+            # One extra row tells whether another page follows
+            rows = cursor.fetchall()
+            if after:
+                total = None
+            elif rows:
+                total = rows[0]['_total']
+            elif offset:
+                # Past the last page there is no row to carry the window total
+                cursor.execute(f"SELECT COUNT(*) FROM user_questions uq WHERE {where_clause}", params)
+                total = cursor.fetchone()[0]
+            else:
+                total = 0
+            has_more = len(rows) > per_page
+            rows = rows[:per_page]
+            questions = self._rows_to_user_questions(rows)
+            
+            # Favorites for the whole page in one lookup instead of a join on every row
+            if user_id and questions:
+                cursor.execute("""
+                    SELECT user_question_id FROM user_favorites
+                    WHERE user_id = ? AND user_question_id IN (SELECT value FROM json_each(?))
+                """, (user_id, json.dumps([q.id for q in questions])))
+                favorited = {row[0] for row in cursor}
+                for question in questions:
+                    question.is_favorited = question.id in favorited
+            
+            # Raw created_at text, so the next comparison matches what is stored
+            next_cursor = (rows[-1]['created_at'], rows[-1]['id']) if has_more else None
+            return questions, total, next_cursor
     
     def update_user_question(self, question_id: int, **kwargs) -> Optional[UserQuestion]:
         """Update user question"""
-        with get_db_connection() as conn:
+        with db_manager.get_connection() as conn:
             cursor = conn.cursor()
             
-            # Build update query dynamically
-            update_fields = []
-            params = []
-            
-            for field, value in kwargs.items():
-                if field == 'topics' and value is not None:
-                    value = json.dumps(value)
-                update_fields.append(f"{field} = ?")
-                params.append(value)
-            
-            if not update_fields:
+            if not kwargs:
                 return self.get_user_question_by_id(question_id)
             
-            update_fields.append("updated_at = ?")
-            params.append(datetime.now().isoformat())
+            # Fields in sorted order, so each field set maps to one SQL text
+            fields = tuple(sorted(kwargs))
+            params = [
+                json.dumps(kwargs[field]) if field == 'topics' and kwargs[field] is not None else kwargs[field]
+                for field in fields
+            ]
             params.append(question_id)
             
-            cursor.execute(f"""
-                UPDATE user_questions 
-                SET {', '.join(update_fields)}
-                WHERE id = ?
-            """, params)
+            cursor.execute(_update_user_question_sql(fields), params)
             
+            row = cursor.fetchone()
             conn.commit()
-            return self.get_user_question_by_id(question_id)
+            invalidate_filter_options()
+            return self._row_to_user_question(row) if row else None
     
     def delete_user_question(self, question_id: int) -> bool:
         """Delete user question"""
-        with get_db_connection() as conn:
+        with db_manager.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM user_questions WHERE id = ?", (question_id,))
             conn.commit()
+            invalidate_filter_options()
             return cursor.rowcount > 0
     
     def request_public_approval(self, question_id: int, user_id: int) -> bool:
         """Request approval to make question public"""
-        with get_db_connection() as conn:
+        with db_manager.get_connection() as conn:
             cursor = conn.cursor()
             
-            # Check if request already exists
-            cursor.execute("""
-                SELECT id FROM approval_requests 
-                WHERE entity_id = ? AND entity_type = 'user_question' 
-                AND request_type = 'question_public' AND status = 'pending'
-            """, (question_id,))
-            
-            if cursor.fetchone():
-                return False  # Request already exists
-            
+            # Insert only when no pending request exists, in a single statement
             cursor.execute("""
                 INSERT INTO approval_requests (request_type, entity_id, entity_type, requested_by)
-                VALUES ('question_public', ?, 'user_question', ?)
-            """, (question_id, user_id))
+                SELECT 'question_public', ?, 'user_question', ?
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM approval_requests 
+                    WHERE entity_id = ? AND entity_type = 'user_question' 
+                    AND request_type = 'question_public' AND status = 'pending'
+                )
+            """, (question_id, user_id, question_id))
             
             conn.commit()
-            return True
+            return cursor.rowcount > 0
     
     def approve_question_public(self, question_id: int, admin_id: int, 
                                admin_notes: Optional[str] = None) -> bool:
         """Approve question to be public"""
-        with get_db_connection() as conn:
+        with db_manager.get_connection() as conn:
             cursor = conn.cursor()
             
-            # Update question
+            # Update question; SQLite can't update two tables in one statement, but
+            # both share a single write transaction and the database's timestamp
             cursor.execute("""
                 UPDATE user_questions 
-                SET is_public = 1, is_approved = 1, approved_by = ?, approved_at = ?
+                SET is_public = 1, is_approved = 1, approved_by = ?, approved_at = CURRENT_TIMESTAMP
                 WHERE id = ?
-            """, (admin_id, datetime.now().isoformat(), question_id))
+                RETURNING approved_at
+            """, (admin_id, question_id))
+            row = cursor.fetchone()
             
-            # Update approval request
+            # Update approval request, stamped with the question's approval time
             cursor.execute("""
                 UPDATE approval_requests 
-                SET status = 'approved', processed_by = ?, processed_at = ?, admin_notes = ?
+                SET status = 'approved', processed_by = ?, processed_at = COALESCE(?, CURRENT_TIMESTAMP),
+                    admin_notes = ?
                 WHERE entity_id = ? AND entity_type = 'user_question' 
                 AND request_type = 'question_public' AND status = 'pending'
-            """, (admin_id, datetime.now().isoformat(), admin_notes, question_id))
+            """, (admin_id, row['approved_at'] if row else None, admin_notes, question_id))
             
             conn.commit()
+            invalidate_filter_options()
             return cursor.rowcount > 0
     
     def reject_question_public(self, question_id: int, admin_id: int, 
                               admin_notes: Optional[str] = None) -> bool:
         """Reject question public request"""
-        with get_db_connection() as conn:
+        with db_manager.get_connection() as conn:
             cursor = conn.cursor()
             
             cursor.execute("""
                 UPDATE approval_requests 
-                SET status = 'rejected', processed_by = ?, processed_at = ?, admin_notes = ?
+                SET status = 'rejected', processed_by = ?, processed_at = CURRENT_TIMESTAMP, admin_notes = ?
                 WHERE entity_id = ? AND entity_type = 'user_question' 
                 AND request_type = 'question_public' AND status = 'pending'
-            """, (admin_id, datetime.now().isoformat(), admin_notes, question_id))
+            """, (admin_id, admin_notes, question_id))
             
             conn.commit()
             return cursor.rowcount > 0
@@ -210,22 +262,23 @@ class UserQuestionRepository:
                                  user_question_id: Optional[int] = None, 
                                  auto_approve_admin: bool = False) -> QuestionReference:
         """Create a question reference"""
-        with get_db_connection() as conn:
+        with db_manager.get_connection() as conn:
             cursor = conn.cursor()
             
             is_approved = auto_approve_admin
             approved_by = created_by if auto_approve_admin else None
-            approved_at = datetime.now().isoformat() if auto_approve_admin else None
             
             cursor.execute("""
                 INSERT INTO question_references 
                 (question_id, user_question_id, url, title, description, 
                  is_approved, created_by, approved_by, approved_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, CASE WHEN ? THEN CURRENT_TIMESTAMP END)
+                RETURNING *
             """, (question_id, user_question_id, url, title, description,
-                  is_approved, created_by, approved_by, approved_at))
+                  is_approved, created_by, approved_by, is_approved))
             
-            reference_id = cursor.lastrowid
+            row = cursor.fetchone()
+            reference_id = row['id']
             
             # Create approval request if not auto-approved
             if not auto_approve_admin:
@@ -235,18 +288,50 @@ class UserQuestionRepository:
                 """, (reference_id, created_by))
             
             conn.commit()
-            return self.get_question_reference_by_id(reference_id)
+            return self._row_to_question_reference(row)
+    
+    def create_question_references_bulk(self, references: List[Tuple[Optional[int], Optional[int], str, Optional[str], Optional[str]]],
+                                        created_by: int, auto_approve_admin: bool = False) -> int:
+        """Create many (question_id, user_question_id, url, title, description) references in one transaction"""
+        if not references:
+            return 0
+        
+        with db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            
+            approved_by = created_by if auto_approve_admin else None
+            
+            # RETURNING hands back each stored id; rowids need not be consecutive
+            reference_ids = [
+                cursor.execute("""
+                    INSERT INTO question_references 
+                    (question_id, user_question_id, url, title, description, 
+                     is_approved, created_by, approved_by, approved_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, CASE WHEN ? THEN CURRENT_TIMESTAMP END)
+                    RETURNING id
+                """, (question_id, user_question_id, url, title, description,
+                      auto_approve_admin, created_by, approved_by, auto_approve_admin)).fetchone()[0]
+                for question_id, user_question_id, url, title, description in references
+            ]
+            
+            # Create approval requests if not auto-approved
+            if not auto_approve_admin:
+                cursor.executemany("""
+                    INSERT INTO approval_requests (request_type, entity_id, entity_type, requested_by)
+                    VALUES ('reference', ?, 'question_reference', ?)
+                """, [(reference_id, created_by) for reference_id in reference_ids])
+            
+            conn.commit()
+            return len(references)
     
     def get_question_reference_by_id(self, reference_id: int) -> Optional[QuestionReference]:
         """Get question reference by ID"""
-        with get_db_connection() as conn:
+        with db_manager.get_connection() as conn:
             cursor = conn.cursor()
             
             cursor.execute("""
-                SELECT qr.*, u.username as creator_username, au.username as approver_username
+                SELECT qr.*
                 FROM question_references qr
-                JOIN users u ON qr.created_by = u.id
-                LEFT JOIN users au ON qr.approved_by = au.id
                 WHERE qr.id = ?
             """, (reference_id,))
             
@@ -260,7 +345,7 @@ class UserQuestionRepository:
                                user_question_id: Optional[int] = None,
                                is_approved_only: bool = False) -> List[QuestionReference]:
         """Get question references"""
-        with get_db_connection() as conn:
+        with db_manager.get_connection() as conn:
             cursor = conn.cursor()
             
             conditions = []
@@ -280,36 +365,64 @@ class UserQuestionRepository:
             where_clause = " AND ".join(conditions) if conditions else "1=1"
             
             cursor.execute(f"""
-                SELECT qr.*, u.username as creator_username, au.username as approver_username
+                SELECT qr.*
                 FROM question_references qr
-                JOIN users u ON qr.created_by = u.id
-                LEFT JOIN users au ON qr.approved_by = au.id
                 WHERE {where_clause}
                 ORDER BY qr.created_at DESC
             """, params)
             
-            return [self._row_to_question_reference(row) for row in cursor.fetchall()]
+            return self._rows_to_question_references(cursor)
+    
+    def get_question_references_bulk(self, user_question_ids: List[int],
+                                     is_approved_only: bool = False) -> Dict[int, List[QuestionReference]]:
+        """Get references for a batch of user questions in one query, keyed by user question id"""
+        if not user_question_ids:
+            return {}
+        
+        with db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            
+            query = """
+                SELECT qr.*
+                FROM question_references qr
+                WHERE qr.user_question_id IN (SELECT value FROM json_each(?))
+            """
+            
+            if is_approved_only:
+                query += " AND qr.is_approved = 1"
+            
+            query += " ORDER BY qr.created_at DESC"
+            
+            cursor.execute(query, (json.dumps(user_question_ids),))
+            
+            references = defaultdict(list)
+            for reference in self._rows_to_question_references(cursor):
+                references[reference.user_question_id].append(reference)
+            return dict(references)
     
     def approve_question_reference(self, reference_id: int, admin_id: int,
                                   admin_notes: Optional[str] = None) -> bool:
         """Approve question reference"""
-        with get_db_connection() as conn:
+        with db_manager.get_connection() as conn:
             cursor = conn.cursor()
             
             # Update reference
             cursor.execute("""
                 UPDATE question_references 
-                SET is_approved = 1, approved_by = ?, approved_at = ?
+                SET is_approved = 1, approved_by = ?, approved_at = CURRENT_TIMESTAMP
                 WHERE id = ?
-            """, (admin_id, datetime.now().isoformat(), reference_id))
+                RETURNING approved_at
+            """, (admin_id, reference_id))
+            row = cursor.fetchone()
             
-            # Update approval request
+            # Update approval request, stamped with the reference's approval time
             cursor.execute("""
                 UPDATE approval_requests 
-                SET status = 'approved', processed_by = ?, processed_at = ?, admin_notes = ?
+                SET status = 'approved', processed_by = ?, processed_at = COALESCE(?, CURRENT_TIMESTAMP),
+                    admin_notes = ?
                 WHERE entity_id = ? AND entity_type = 'question_reference' 
                 AND request_type = 'reference' AND status = 'pending'
-            """, (admin_id, datetime.now().isoformat(), admin_notes, reference_id))
+            """, (admin_id, row['approved_at'] if row else None, admin_notes, reference_id))
             
             conn.commit()
             return cursor.rowcount > 0
@@ -319,37 +432,29 @@ class UserQuestionRepository:
                                  time_period: str, frequency: float, 
                                  created_by: int) -> UserQuestionCompany:
         """Create a company association for user question"""
-        with get_db_connection() as conn:
+        with db_manager.get_connection() as conn:
             cursor = conn.cursor()
             
+            # RETURNING hands back the stored row (defaults included) without a second query;
+            # its values are taken before column affinity, hence the float() below
             cursor.execute("""
                 INSERT INTO user_question_companies 
                 (user_question_id, company_id, time_period, frequency, created_by)
                 VALUES (?, ?, ?, ?, ?)
+                RETURNING *
             """, (question_id, company_id, time_period, frequency, created_by))
             
-            association_id = cursor.lastrowid
+            row = cursor.fetchone()
             conn.commit()
+            invalidate_filter_options()
             
-            # Get the created association with company name
-            cursor.execute("""
-                SELECT uqc.*, c.name as company_name, u.username as creator_username
-                FROM user_question_companies uqc
-                JOIN companies c ON uqc.company_id = c.id
-                JOIN users u ON uqc.created_by = u.id
-                WHERE uqc.id = ?
-            """, (association_id,))
-            
-            row = cursor.fetchone()
             if row:
-                from app.utils.logging import logger
-                logger.info(f"Company association row data: {dict(row)}")
                 return UserQuestionCompany(
                     id=row['id'],
                     user_question_id=row['user_question_id'],
                     company_id=row['company_id'],
                     time_period=row['time_period'],
-                    frequency=row['frequency'],
+                    frequency=float(row['frequency']),
                     is_approved=bool(row['is_approved']),
                     created_by=row['created_by'],
                     approved_by=row['approved_by'],
@@ -358,35 +463,58 @@ class UserQuestionRepository:
                 )
             return None
     
+    def create_company_associations_bulk(self, question_id: int,
+                                         associations: List[Tuple[int, str, float]],
+                                         created_by: int) -> int:
+        """Create many (company_id, time_period, frequency) associations in one transaction"""
+        with db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.executemany("""
+                INSERT INTO user_question_companies 
+                (user_question_id, company_id, time_period, frequency, created_by)
+                VALUES (?, ?, ?, ?, ?)
+            """, [
+                (question_id, company_id, time_period, frequency, created_by)
+                for company_id, time_period, frequency in associations
+            ])
+            
+            conn.commit()
+            invalidate_filter_options()
+            return cursor.rowcount
+    
     def get_company_associations(self, question_id: int, is_approved_only: bool = False) -> List[UserQuestionCompany]:
         """Get company associations for a user question"""
-        with get_db_connection() as conn:
+        return self.get_company_associations_bulk([question_id], is_approved_only).get(question_id, [])
+    
+    def get_company_associations_bulk(self, question_ids: List[int],
+                                      is_approved_only: bool = False) -> Dict[int, List[UserQuestionCompany]]:
+        """Get company associations for a batch of user questions in one query, keyed by question id"""
+        if not question_ids:
+            return {}
+        
+        with db_manager.get_connection() as conn:
             cursor = conn.cursor()
             
             query = """
-                SELECT uqc.*, c.name as company_name, u.username as creator_username,
-                       au.username as approver_username
+                SELECT uqc.*, c.name as company_name
                 FROM user_question_companies uqc
                 JOIN companies c ON uqc.company_id = c.id
-                LEFT JOIN users u ON uqc.created_by = u.id
-                LEFT JOIN users au ON uqc.approved_by = au.id
-                WHERE uqc.user_question_id = ?
+                WHERE uqc.user_question_id IN (SELECT value FROM json_each(?))
             """
             
-            params = [question_id]
-            
             if is_approved_only:
                 query += " AND uqc.is_approved = 1"
             
             query += " ORDER BY uqc.created_at DESC"
             
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
+            cursor.execute(query, (json.dumps(question_ids),))
+            fromiso = datetime.fromisoformat
             
-            associations = []
-            for row in rows:
-                # Create the association with the company_name attribute
-                assoc = UserQuestionCompany(
+            associations = defaultdict(list)
+            mapped = []
+            for row in cursor:
+                association = UserQuestionCompany(
                     id=row['id'],
                     user_question_id=row['user_question_id'],
                     company_id=row['company_id'],
@@ -395,38 +523,60 @@ class UserQuestionRepository:
                     is_approved=bool(row['is_approved']),
                     created_by=row['created_by'],
                     approved_by=row['approved_by'],
-                    created_at=datetime.fromisoformat(row['created_at']),
-                    approved_at=datetime.fromisoformat(row['approved_at']) if row['approved_at'] else None
+                    created_at=fromiso(row['created_at']),
+                    approved_at=fromiso(row['approved_at']) if row['approved_at'] else None,
+                    company_name=row['company_name']
                 )
-                # Add the company_name as an attribute
-                setattr(assoc, 'company_name', row['company_name'])
-                setattr(assoc, 'creator_username', row['creator_username'])
-                setattr(assoc, 'approver_username', row['approver_username'])
-                associations.append(assoc)
-            
-            return associations
+                associations[association.user_question_id].append(association)
+                mapped.append(association)
+            self._attach_usernames(mapped)
+            return dict(associations)
+    
+    def get_approved_company_data(self, question_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+        """Approved company rows (company_name, frequency, time_period) for the listing, keyed by question id"""
+        if not question_ids:
+            return {}
+        
+        with db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            # Only the columns the listing shows; no association objects or usernames
+            cursor.execute("""
+                SELECT uqc.user_question_id, c.name as company_name, uqc.frequency, uqc.time_period
+                FROM user_question_companies uqc
+                JOIN companies c ON uqc.company_id = c.id
+                WHERE uqc.user_question_id IN (SELECT value FROM json_each(?))
+                  AND uqc.is_approved = 1
+                ORDER BY uqc.created_at DESC
+            """, (json.dumps(question_ids),))
+            
+            company_data = defaultdict(list)
+            for question_id, company_name, frequency, time_period in cursor:
+                company_data[question_id].append({
+                    'company_name': company_name,
+                    'frequency': frequency,
+                    'time_period': time_period
+                })
+            return dict(company_data)
     
     # Favorites
     def add_favorite(self, user_id: int, question_id: Optional[int] = None,
                     user_question_id: Optional[int] = None) -> bool:
         """Add question to favorites"""
-        with get_db_connection() as conn:
+        with db_manager.get_connection() as conn:
             cursor = conn.cursor()
             
-            try:
-                cursor.execute("""
-                    INSERT INTO user_favorites (user_id, question_id, user_question_id)
-                    VALUES (?, ?, ?)
-                """, (user_id, question_id, user_question_id))
-                conn.commit()
-                return True
-            except sqlite3.IntegrityError:
-                return False  # Already favorited
+            # The unique favorite indexes turn a duplicate into a no-op
+            cursor.execute("""
+                INSERT OR IGNORE INTO user_favorites (user_id, question_id, user_question_id)
+                VALUES (?, ?, ?)
+            """, (user_id, question_id, user_question_id))
+            conn.commit()
+            return cursor.rowcount > 0  # False when already favorited
     
     def remove_favorite(self, user_id: int, question_id: Optional[int] = None,
                        user_question_id: Optional[int] = None) -> bool:
         """Remove question from favorites"""
-        with get_db_connection() as conn:
+        with db_manager.get_connection() as conn:
             cursor = conn.cursor()
             
             if question_id:
@@ -443,9 +593,36 @@ class UserQuestionRepository:
             conn.commit()
             return cursor.rowcount > 0
     
+    def toggle_favorite(self, user_id: int, question_id: Optional[int] = None,
+                        user_question_id: Optional[int] = None) -> bool:
+        """Favorite the question, or unfavorite it if it already was one"""
+        with db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            
+            # The unique indexes turn a duplicate insert into a no-op we can detect
+            cursor.execute("""
+                INSERT OR IGNORE INTO user_favorites (user_id, question_id, user_question_id)
+                VALUES (?, ?, ?)
+            """, (user_id, question_id, user_question_id))
+            
+            if cursor.rowcount == 0:
+                if question_id:
+                    cursor.execute("""
+                        DELETE FROM user_favorites 
+                        WHERE user_id = ? AND question_id = ?
+                    """, (user_id, question_id))
+                else:
+                    cursor.execute("""
+                        DELETE FROM user_favorites 
+                        WHERE user_id = ? AND user_question_id = ?
+                    """, (user_id, user_question_id))
+            
+            conn.commit()
+            return True
+    
     def get_user_favorites(self, user_id: int) -> List[Dict[str, Any]]:
         """Get user's favorite questions"""
-        with get_db_connection() as conn:
+        with db_manager.get_connection() as conn:
             cursor = conn.cursor()
             
             cursor.execute("""
@@ -459,12 +636,12 @@ class UserQuestionRepository:
                 ORDER BY uf.created_at DESC
             """, (user_id,))
             
-            return [dict(row) for row in cursor.fetchall()]
+            return _dict_rows(cursor)
     
     # Approval Requests
     def get_pending_approval_requests(self, request_type: Optional[RequestType] = None) -> List[Dict[str, Any]]:
         """Get pending approval requests"""
-        with get_db_connection() as conn:
+        with db_manager.get_connection() as conn:
             cursor = conn.cursor()
             
             where_clause = "ar.status = 'pending'"
@@ -475,49 +652,82 @@ class UserQuestionRepository:
                 params.append(request_type.value)
             
             cursor.execute(f"""
-                SELECT ar.*, u.username as requester_username
+                SELECT ar.*
                 FROM approval_requests ar
-                JOIN users u ON ar.requested_by = u.id
                 WHERE {where_clause}
                 ORDER BY ar.created_at ASC
             """, params)
             
-            return [dict(row) for row in cursor.fetchall()]
+            requests = _dict_rows(cursor)
+            usernames = get_usernames(request['requested_by'] for request in requests)
+            for request in requests:
+                request['requester_username'] = usernames.get(request['requested_by'])
+            return requests
     
     # Helper methods
     def _row_to_user_question(self, row) -> UserQuestion:
         """Convert database row to UserQuestion object"""
-        topics = json.loads(row['topics']) if row['topics'] else None
+        return self._rows_to_user_questions((row,))[0]
+    
+    def _rows_to_user_questions(self, rows) -> List[UserQuestion]:
+        """Convert database rows to UserQuestion objects, binding the converters once per batch"""
+        fromiso = datetime.fromisoformat
+        parse_topics = _parse_topics
+        difficulty = _DIFFICULTY_BY_VALUE.__getitem__
         
-        return UserQuestion(
-            id=row['id'],
-            title=row['title'],
-            description=row['description'],
-            difficulty=QuestionDifficulty(row['difficulty']),
-            topics=topics,
-            solution=row['solution'],
-            link=row['link'],
-            is_public=bool(row['is_public']),
-            is_approved=bool(row['is_approved']),
-            created_by=row['created_by'],
-            approved_by=row['approved_by'],
-            created_at=datetime.fromisoformat(row['created_at']),
-            updated_at=datetime.fromisoformat(row['updated_at']) if row['updated_at'] else None,
-            approved_at=datetime.fromisoformat(row['approved_at']) if row['approved_at'] else None
-        )
+        # Rows are consumed as they stream in; usernames are filled in afterwards from the models
+        questions = [
+            UserQuestion(
+                id=row['id'],
+                title=row['title'],
+                description=row['description'],
+                difficulty=difficulty(row['difficulty']),
+                topics=list(parse_topics(row['topics'])) if row['topics'] else None,
+                solution=row['solution'],
+                link=row['link'],
+                is_public=bool(row['is_public']),
+                is_approved=bool(row['is_approved']),
+                created_by=row['created_by'],
+                approved_by=row['approved_by'],
+                created_at=fromiso(row['created_at']),
+                updated_at=fromiso(row['updated_at']) if row['updated_at'] else None,
+                approved_at=fromiso(row['approved_at']) if row['approved_at'] else None
+            )
+            for row in rows
+        ]
+        self._attach_usernames(questions)
+        return questions
     
     def _row_to_question_reference(self, row) -> QuestionReference:
         """Convert database row to QuestionReference object"""
-        return QuestionReference(
-            id=row['id'],
-            question_id=row['question_id'],
-            user_question_id=row['user_question_id'],
-            url=row['url'],
-            title=row['title'],
-            description=row['description'],
-            is_approved=bool(row['is_approved']),
-            created_by=row['created_by'],
-            approved_by=row['approved_by'],
-            created_at=datetime.fromisoformat(row['created_at']),
-            approved_at=datetime.fromisoformat(row['approved_at']) if row['approved_at'] else None
-        )
+        return self._rows_to_question_references((row,))[0]
+    
+    def _rows_to_question_references(self, rows) -> List[QuestionReference]:
+        """Convert database rows to QuestionReference objects, binding the converters once per batch"""
+        fromiso = datetime.fromisoformat
+        
+        references = [
+            QuestionReference(
+                id=row['id'],
+                question_id=row['question_id'],
+                user_question_id=row['user_question_id'],
+                url=row['url'],
+                title=row['title'],
+                description=row['description'],
+                is_approved=bool(row['is_approved']),
+                created_by=row['created_by'],
+                approved_by=row['approved_by'],
+                created_at=fromiso(row['created_at']),
+                approved_at=fromiso(row['approved_at']) if row['approved_at'] else None
+            )
+            for row in rows
+        ]
+        self._attach_usernames(references)
+        return references
+    
+    def _attach_usernames(self, items) -> None:
+        """Fill creator/approver usernames on mapped models with one lookup"""
+        usernames = get_usernames([item.created_by for item in items] + [item.approved_by for item in items])
+        for item in items:
+            item.creator_username = usernames.get(item.created_by)
+            item.approver_username = usernames.get(item.approved_by)
@@ -1,75 +1,158 @@
 """
 User repository for database operations
 """
-from typing import List, Optional
-from datetime import datetime
-from app.config.database import get_db_connection
+import json
+import sqlite3
+from typing import Dict, Iterable, List, Optional, Tuple
+from functools import lru_cache
+from app.utils.database import db_manager
+from app.utils.cache import TTLCache
 from app.models.user_models import User, UserRole
 from app.schemas.user_schemas import UserCreate
 
 
+# User columns safe to hand out (no password hash)
+_USER_COLUMNS = "id, email, username, full_name, role, is_active, created_at"
+_FIND_BY_ID_SQL = f"SELECT {_USER_COLUMNS} FROM users WHERE id = ?"
+
+
+# Columns update_user may set; names are interpolated into SQL, so nothing else is accepted
+_UPDATABLE_USER_COLUMNS = frozenset({"email", "username", "full_name", "password_hash", "role", "is_active"})
+
+
+@lru_cache(maxsize=32)
+def _update_user_sql(fields: Tuple[str, ...]) -> str:
+    """UPDATE statement for one sorted set of fields; stable text keeps sqlite3's statement cache warm"""
+    unknown = set(fields) - _UPDATABLE_USER_COLUMNS
+    if unknown:
+        raise ValueError(f"Cannot update user fields: {', '.join(sorted(unknown))}")
+    assignments = ", ".join(f"{field} = ?" for field in fields)
+    return f"UPDATE users SET {assignments} WHERE id = ? RETURNING {_USER_COLUMNS}"
+
+
+# Usernames rarely change; update_user drops an entry when one does
+_username_cache = TTLCache(maxsize=4096, ttl=3600.0)
+
+# Finder results keyed by (lookup, value); every request's auth resolves its user
+# through these. Misses are not cached so a freshly registered user is found at once.
+_user_cache = TTLCache(maxsize=2048, ttl=60.0)
+
+# User count for the first listing page; a short TTL is enough for an admin view
+_user_count_cache = TTLCache(maxsize=1, ttl=30.0)
+
+# Columns find_all may sort by; the name is interpolated into SQL
+_USER_ORDER_COLUMNS = frozenset({"id", "username", "email", "created_at"})
+
+
+def _cached_user(key: Tuple[str, object], load) -> Optional[sqlite3.Row]:
+    """Return the cached user row, loading and caching it on a miss (rows are immutable, so shared)"""
+    user = _user_cache.get(key)
+    if user is None:
+        user = load()
+        if user is None:
+            return None
+        _user_cache.set(key, user)
+    return user
+
+
+def get_usernames(user_ids: Iterable[Optional[int]]) -> Dict[int, str]:
+    """Map user ids to usernames, reading only the uncached ids from the database"""
+    usernames = {}
+    missing = []
+    for user_id in set(user_ids):
+        if user_id is None:
+            continue
+        username = _username_cache.get(user_id)
+        if username is None:
+            missing.append(user_id)
+        else:
+            usernames[user_id] = username
+    
+    if missing:
+        with db_manager.get_connection() as conn:
+            rows = conn.execute(
+                "SELECT id, username FROM users WHERE id IN (SELECT value FROM json_each(?))",
+                (json.dumps(missing),)
+            ).fetchall()
+        for row in rows:
+            _username_cache.set(row['id'], row['username'])
+            usernames[row['id']] = row['username']
+    return usernames
+
+
 class UserRepository:
     """Repository for user-related database operations"""
     
-    def find_all(self, **kwargs) -> List[dict]:
-        """Find all users"""
-        with get_db_connection() as conn:
+    def find_all(self, limit: int = 50, offset: int = 0, order_by: str = "id",
+                 **kwargs) -> Tuple[List[sqlite3.Row], Optional[int]]:
+        """Find a page of users; the total is only counted for the first page"""
+        if order_by not in _USER_ORDER_COLUMNS:
+            raise ValueError(f"Cannot order users by: {order_by}")
+        
+        with db_manager.get_connection() as conn:
             cursor = conn.cursor()
-            query = "SELECT id, email, username, full_name, role, is_active, created_at FROM users"
-            cursor.execute(query)
-            return [dict(row) for row in cursor.fetchall()]
+            query = f"SELECT {_USER_COLUMNS} FROM users ORDER BY {order_by}, id LIMIT ? OFFSET ?"
+            cursor.execute(query, (limit, offset))
+            rows = cursor.fetchall()
+            
+            total = None
+            if offset == 0:
+                # A short first page already is the whole table
+                if len(rows) < limit:
+                    total = len(rows)
+                else:
+                    total = _user_count_cache.get_or_set(
+                        "users", lambda: cursor.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+                    )
+        return rows, total
     
-    def find_by_id(self, id: int) -> Optional[dict]:
+    def find_by_id(self, id: int) -> Optional[sqlite3.Row]:
         """Find user by ID"""
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            query = "SELECT id, email, username, full_name, role, is_active, created_at FROM users WHERE id = ?"
-            cursor.execute(query, (id,))
-            row = cursor.fetchone()
-            return dict(row) if row else None
+        return _cached_user(("id", id), lambda: self._find_one(_FIND_BY_ID_SQL, id))
     
     def get_user_by_id(self, id: int) -> Optional[User]:
         """Get User model by ID"""
-        user_data = self.find_by_id(id)
-        if not user_data:
-            return None
-        
+        row = self.find_by_id(id)
+        return self._row_to_user(row) if row else None
+    
+    @staticmethod
+    def _row_to_user(row) -> User:
+        """Build a User from a user row (no password hash)"""
         return User(
-            id=user_data['id'],
-            email=user_data['email'],
-            username=user_data['username'],
-            full_name=user_data['full_name'],
+            id=row['id'],
+            email=row['email'],
+            username=row['username'],
+            full_name=row['full_name'],
             password_hash='',  # Don't expose password hash
-            role=UserRole(user_data['role']),
-            is_active=bool(user_data['is_active']),
-            created_at=datetime.fromisoformat(user_data['created_at'])
+            role=UserRole(row['role']),
+            is_active=bool(row['is_active']),
+            created_at=row['created_at']
         )
     
-    def find_by_email(self, email: str) -> Optional[dict]:
+    def find_by_email(self, email: str) -> Optional[sqlite3.Row]:
         """Find user by email"""
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            query = "SELECT * FROM users WHERE email = ?"
-            cursor.execute(query, (email,))
-            row = cursor.fetchone()
-            return dict(row) if row else None
+        return _cached_user(("email", email), lambda: self._find_one("SELECT * FROM users WHERE email = ?", email))
     
-    def find_by_username(self, username: str) -> Optional[dict]:
+    def find_by_username(self, username: str) -> Optional[sqlite3.Row]:
         """Find user by username"""
-        with get_db_connection() as conn:
+        return _cached_user(("username", username), lambda: self._find_one("SELECT * FROM users WHERE username = ?", username))
+    
+    def _find_one(self, query: str, value) -> Optional[sqlite3.Row]:
+        """Run a single-row user lookup"""
+        with db_manager.get_connection() as conn:
             cursor = conn.cursor()
-            query = "SELECT * FROM users WHERE username = ?"
-            cursor.execute(query, (username,))
-            row = cursor.fetchone()
-            return dict(row) if row else None
+            cursor.execute(query, (value,))
+            return cursor.fetchone()
     
-    def create_user(self, user_data: UserCreate, hashed_password: str, role: UserRole = UserRole.USER) -> dict:
+    def create_user(self, user_data: UserCreate, hashed_password: str, role: UserRole = UserRole.USER) -> sqlite3.Row:
         """Create a new user"""
-        with get_db_connection() as conn:
+        with db_manager.get_connection() as conn:
             cursor = conn.cursor()
-            query = """
+            # RETURNING hands back the created user without a second query
+            query = f"""
                 INSERT INTO users (email, username, full_name, password_hash, role, is_active)
                 VALUES (?, ?, ?, ?, ?, ?)
+                RETURNING {_USER_COLUMNS}
             """
             cursor.execute(query, (
                 user_data.email,
@@ -79,39 +162,46 @@ class UserRepository:
                 role.value,
                 True  # Default to active
             ))
+            row = cursor.fetchone()
             conn.commit()
-            user_id = cursor.lastrowid
         
-        # Return the created user
-        return self.find_by_id(user_id)
+        _user_count_cache.invalidate()
+        return row
     
-    def update_user(self, user_id: int, **kwargs) -> Optional[dict]:
+    def update_user(self, user_id: int, **kwargs) -> Optional[sqlite3.Row]:
         """Update user data"""
         if not kwargs:
             return self.find_by_id(user_id)
         
-        # Build dynamic update query
-        set_clauses = []
-        params = []
+        # Only fields with values are set; sorted so each field set maps to one SQL text
+        fields = tuple(sorted(key for key, value in kwargs.items() if value is not None))
         
-        for key, value in kwargs.items():
-            if value is not None:
-                set_clauses.append(f"{key} = ?")
-                params.append(value)
-        
-        if not set_clauses:
+        if not fields:
             return self.find_by_id(user_id)
         
+        params = [kwargs[field] for field in fields]
         params.append(user_id)
-        query = f"UPDATE users SET {', '.join(set_clauses)} WHERE id = ?"
         
-        with get_db_connection() as conn:
+        with db_manager.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(query, params)
+            cursor.execute(_update_user_sql(fields), params)
+            row = cursor.fetchone()
             conn.commit()
         
-        return self.find_by_id(user_id)
+        if 'username' in fields:
+            _username_cache.invalidate(user_id)
+        # The old username/email keys aren't known here; updates are rare, so drop them all
+        _user_cache.invalidate()
+        
+        return row
     
     def delete_user(self, user_id: int) -> bool:
         """Delete a user (soft delete by setting is_active to False)"""
-        return self.update_user(user_id, is_active=False) is not None
+        # Only success matters here, so no RETURNING row is built
+        with db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("UPDATE users SET is_active = 0 WHERE id = ?", (user_id,))
+            conn.commit()
+        
+        _user_cache.invalidate()
+        return cursor.rowcount > 0
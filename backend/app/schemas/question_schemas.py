@@ -1,7 +1,7 @@
 """
 Pydantic models for API requests and responses
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, validator
 from typing import Optional, List, Dict, Any
 from enum import Enum
 
@@ -103,18 +103,27 @@ class QuestionResponse(BaseModel):
 
 class QuestionFilters(BaseModel):
     """Question filtering parameters"""
-    companies: Optional[str] = Field(None, description="Comma-separated company names")
+    companies: List[str] = Field(default_factory=list, description="Company names (comma-separated on input)")
     company_logic: LogicEnum = Field(LogicEnum.OR, description="Logic for company filtering")
-    difficulties: Optional[str] = Field(None, description="Comma-separated difficulties")
-    time_periods: Optional[str] = Field(None, description="Comma-separated time periods")
+    difficulties: List[str] = Field(default_factory=list, description="Difficulties (comma-separated on input)")
+    time_periods: List[str] = Field(default_factory=list, description="Time periods (comma-separated on input)")
     time_period_logic: LogicEnum = Field(LogicEnum.OR, description="Logic for time period filtering")
-    topics: Optional[str] = Field(None, description="Comma-separated topics")
+    topics: List[str] = Field(default_factory=list, description="Topics (comma-separated on input)")
     search: Optional[str] = Field(None, description="Search in question titles")
     page: int = Field(1, ge=1, description="Page number")
     per_page: int = Field(20, ge=1, le=100, description="Items per page")
     sort_by: SortByEnum = Field(SortByEnum.FREQUENCY, description="Sort field")
     sort_order: SortOrderEnum = Field(SortOrderEnum.DESC, description="Sort order")
 
+    @validator('companies', 'difficulties', 'time_periods', 'topics', pre=True)
+    def split_comma_separated(cls, v):
+        """Parse comma-separated query values once, dropping blank items"""
+        if v is None:
+            return []
+        if isinstance(v, str):
+            v = v.split(',')
+        return [item.strip() for item in v if item and item.strip()]
+
 
 class OverallStats(BaseModel):
     """Overall application statistics"""
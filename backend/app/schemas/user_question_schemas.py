@@ -189,10 +189,14 @@ class AdminStats(BaseModel):
 # Question list with pagination
 class QuestionListResponse(BaseModel):
     questions: List[UserQuestionResponse]
-    total: int
+    # Not counted for cursor requests
+    total: Optional[int] = None
     page: int
     per_page: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    # Pass back as cursor_created_at/cursor_id to fetch the next page without OFFSET
+    next_cursor_created_at: Optional[str] = None
+    next_cursor_id: Optional[int] = None
 
 
 # Update forward references
@@ -2,9 +2,18 @@
 Company service for business logic
 """
 from typing import List
+from pydantic import TypeAdapter
 from app.services.base_service import BaseService
 from app.repositories.company_repository import CompanyRepository
 from app.schemas.question_schemas import Company
+from app.utils.cache import TTLCache
+
+
+# Built once; validates the whole list in pydantic-core instead of one __init__ per row
+_COMPANY_LIST = TypeAdapter(List[Company])
+
+# The company list backs every filter bar and is loaded offline, so a long TTL is safe
+_companies_cache = TTLCache(maxsize=1, ttl=300.0)
 
 
 class CompanyService(BaseService):
@@ -15,9 +24,13 @@ class CompanyService(BaseService):
         self.company_repo = CompanyRepository()
     
     def get_all_companies(self) -> List[Company]:
-        """Get all companies"""
+        """Get all companies (shared cached list; do not mutate)"""
+        return _companies_cache.get_or_set("all", self._load_companies)
+    
+    def _load_companies(self) -> List[Company]:
+        """Read and validate the full company list"""
         companies_data = self.company_repo.find_all()
-        return [Company(**company) for company in companies_data]
+        return _COMPANY_LIST.validate_python(companies_data)
     
     def get_company_by_id(self, company_id: int) -> Company:
         """Get company by ID"""
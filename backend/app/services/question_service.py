@@ -1,17 +1,122 @@
 """
 Question service for business logic
 """
-from typing import List, Dict, Any, Optional
+import json
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Iterable, Optional, Sequence
 from app.services.base_service import BaseService
-from app.repositories.question_repository import QuestionRepository
+from app.repositories.question_repository import QuestionRepository, question_data_version
 from app.repositories.company_repository import CompanyRepository
+from app.repositories.user_question_repository import UserQuestionRepository
+from app.utils.cache import TTLCache
 from app.utils.logging import logger, log_exception
 from app.schemas.question_schemas import (
     QuestionFilters, QuestionResponse, Question, GroupedCompanyQuestion,
-    FilterStats, CompanyData, OverallStats
+    FilterStats, CompanyData, OverallStats, DifficultyEnum
 )
 
 
+# Fixed filter options, shared rather than rebuilt per request
+_DIFFICULTIES = ("EASY", "MEDIUM", "HARD")
+_TIME_PERIODS = ("30_days", "3_months", "6_months", "more_than_6_months", "all_time")
+
+# Stored difficulty text -> enum member; a dict lookup skips the Enum call machinery
+_DIFFICULTY_BY_VALUE = {difficulty.value: difficulty for difficulty in DifficultyEnum}
+
+# Overall statistics scan whole tables; a short TTL bounds staleness
+_stats_cache = TTLCache(maxsize=1, ttl=60.0)
+
+# Whole listing pages for repeated filter/page combinations. Keys carry the question
+# data version, so a user-question or company-association write retires every
+# cached page at once
+_page_cache = TTLCache(maxsize=512, ttl=30.0)
+
+# Pages that are cheap to rebuild are not cached, leaving slots for costly ones
+_PAGE_CACHE_MIN_TOTAL = 20
+_PAGE_CACHE_MIN_SECONDS = 0.010
+
+# User questions share the listing with regular questions under this ID offset
+USER_ID_OFFSET = 1_000_000
+
+# Independent listing queries run side by side; sqlite3 releases the GIL while a
+# statement executes, and each pool thread keeps its own connection
+_query_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="question-query")
+
+# Stats for an empty result; shared by every empty response, so never mutate it
+_EMPTY_FILTER_STATS = FilterStats(
+    total_questions=0,
+    easy_count=0,
+    medium_count=0,
+    hard_count=0,
+    companies_count=0,
+    time_periods=[],
+    topics=[]
+)
+
+
+def _empty_response(page: int, per_page: int) -> QuestionResponse:
+    """Response for a filter that matched nothing"""
+    return QuestionResponse.model_construct(
+        questions=[],
+        total=0,
+        page=page,
+        per_page=per_page,
+        total_pages=0,
+        stats=_EMPTY_FILTER_STATS
+    )
+
+
+def _page_cache_key(filters: QuestionFilters, user_id: Optional[int]) -> tuple:
+    """Cache key covering every input that shapes a listing page"""
+    # user_id decides which private user questions are visible
+    return (
+        question_data_version(), user_id,
+        tuple(filters.companies), filters.company_logic,
+        tuple(filters.difficulties),
+        tuple(filters.time_periods), filters.time_period_logic,
+        tuple(filters.topics), filters.search,
+        filters.page, filters.per_page, filters.sort_by, filters.sort_order,
+    )
+
+
+def _question_from_row(row: Dict[str, Any]) -> Question:
+    """Build a Question from a trusted listing row without re-validating it"""
+    # model_construct stores values as given, so the enum and bools are converted here
+    return Question.model_construct(
+        id=row['id'],
+        title=row['title'],
+        difficulty=_DIFFICULTY_BY_VALUE[row['difficulty']],
+        acceptance_rate=row['acceptance_rate'],
+        link=row['link'],
+        topics=row['topics'],
+        description=row['description'],
+        added_by=row['added_by'],
+        is_approved=bool(row['is_approved']),
+        is_public=bool(row['is_public'])
+    )
+
+
+def _group_companies(company_rows: Iterable[Dict[str, Any]]) -> Dict[str, CompanyData]:
+    """Group company rows by company name, keeping the first frequency seen"""
+    # One pass; time periods go straight into a set
+    frequencies = {}
+    time_periods = defaultdict(set)
+    first_frequency = frequencies.setdefault
+    for c_row in company_rows:
+        company_name = c_row['company_name']
+        first_frequency(company_name, c_row['frequency'])
+        time_periods[company_name].add(c_row['time_period'])
+    
+    # Built from already-typed parts, so the models skip validation
+    company_model = CompanyData.model_construct
+    return {
+        company_name: company_model(frequency=frequency, time_periods=list(time_periods[company_name]))
+        for company_name, frequency in frequencies.items()
+    }
+
+
 class QuestionService(BaseService):
     """Service for question-related business logic"""
     
@@ -19,152 +124,60 @@ class QuestionService(BaseService):
         super().__init__()
         self.question_repo = QuestionRepository()
         self.company_repo = CompanyRepository()
+        self.user_question_repo = UserQuestionRepository()
     
     def get_filtered_questions(self, filters: QuestionFilters, user_id: Optional[int] = None) -> QuestionResponse:
         """Get filtered and paginated questions including user questions"""
         logger.info(f"Service: Getting filtered questions with filters: {filters}, user_id: {user_id}")
         
+        # Cached pages are shared between requests; callers only serialize them
+        key = _page_cache_key(filters, user_id)
+        response = _page_cache.get(key)
+        if response is None:
+            started = time.perf_counter()
+            response = self._load_filtered_questions(filters, user_id)
+            if (response.total >= _PAGE_CACHE_MIN_TOTAL
+                    and time.perf_counter() - started >= _PAGE_CACHE_MIN_SECONDS):
+                _page_cache.set(key, response)
+        return response
+    
+    def _load_filtered_questions(self, filters: QuestionFilters, user_id: Optional[int]) -> QuestionResponse:
+        """Run the queries behind get_filtered_questions"""
         try:
-            # Get regular questions with company data
-            logger.debug("Calling question_repo.get_filtered_questions")
-            questions_data, regular_total = self.question_repo.get_filtered_questions(filters, user_id)
+            # Wave 1: the two listings and the filter statistics are independent, so they
+            # run concurrently (each worker thread uses its own SQLite connection)
+            logger.debug("Fetching regular questions, user questions and filter stats concurrently")
+            # Regular questions come back with their company data from the page query
+            questions_future = _query_pool.submit(
+                self.question_repo.get_filtered_questions, filters, user_id, with_companies=True
+            )
+            user_questions_future = _query_pool.submit(self.question_repo.get_user_questions_for_display, filters, user_id)
+            stats_future = _query_pool.submit(self.question_repo.get_filter_stats, filters)
+            questions_data, regular_total = questions_future.result()
             logger.debug(f"Retrieved {len(questions_data)} regular questions out of {regular_total} total")
-            
-            # Get user questions that should be visible
-            logger.debug("Calling question_repo.get_user_questions_for_display")
-            user_questions_data, user_total = self.question_repo.get_user_questions_for_display(filters, user_id)
+            user_questions_data, user_total = user_questions_future.result()
             logger.debug(f"Retrieved {len(user_questions_data)} user questions out of {user_total} total")
             
-            # Combine the results
-            all_questions_data = questions_data + user_questions_data
             total = regular_total + user_total
             
-            if not all_questions_data:
-                return QuestionResponse(
-                    questions=[],
-                    total=0,
-                    page=filters.page,
-                    per_page=filters.per_page,
-                    total_pages=0,
-                    stats=FilterStats(
-                        total_questions=0,
-                        easy_count=0,
-                        medium_count=0,
-                        hard_count=0,
-                        companies_count=0,
-                        time_periods=[],
-                        topics=[]
-                    )
-                )
+            if not questions_data and not user_questions_data:
+                return _empty_response(page=filters.page, per_page=filters.per_page)
             
-            # Get company data for the regular questions
-            regular_question_ids = [q['id'] for q in questions_data]
-            company_data = self.question_repo.get_company_data_for_questions(regular_question_ids)
+            # Wave 2: approved company data for the user questions, keyed on their IDs
+            company_data = {q['id']: q['companies'] for q in questions_data}
+            user_company_data = self._get_user_company_data([q['id'] for q in user_questions_data])
             
-            # Get user question company associations
-            user_question_ids = [q['id'] for q in user_questions_data]
-            user_company_data = {}
-            if user_question_ids:
-                print(f"DEBUG: Getting company data for user questions: {user_question_ids}")
-                # Import here to avoid circular imports
-                from app.repositories.user_question_repository import UserQuestionRepository
-                user_repo = UserQuestionRepository()
-                for user_q_id in user_question_ids:
-                    # user_q_id is the original ID from user_questions table
-                    # The combined ID in main questions is 1000000 + user_q_id
-                    combined_id = 1000000 + user_q_id
-                    associations = user_repo.get_company_associations(user_q_id, is_approved_only=True)
-                    print(f"DEBUG: User question {user_q_id} (combined {combined_id}) has {len(associations)} approved associations")
-                    if associations:
-                        user_company_data[combined_id] = []
-                        for assoc in associations:
-                            print(f"DEBUG: Adding association: {getattr(assoc, 'company_name', 'Unknown')}")
-                            user_company_data[combined_id].append({
-                                'company_name': getattr(assoc, 'company_name', 'Unknown'),
-                                'frequency': assoc.frequency,
-                                'time_period': assoc.time_period
-                            })
-                print(f"DEBUG: Final user_company_data: {user_company_data}")
-        
             # Transform to grouped format
-            grouped_questions = []
-            for q_data in all_questions_data:
-                # Handle user questions explicitly to ensure all fields are correct
-                if q_data['id'] >= 1000000:  # User question
-                    # Create a clean dict with exactly the fields needed by Question model
-                    clean_data = {
-                        'id': q_data['id'],
-                        'title': q_data['title'],
-                        'difficulty': q_data['difficulty'].upper() if q_data['difficulty'] else 'MEDIUM',  # Convert to uppercase
-                        'acceptance_rate': None if q_data.get('acceptance_rate') is None else q_data['acceptance_rate'],
-                        'link': q_data['link'],
-                        'topics': q_data.get('topics', ''),
-                        'description': q_data.get('description', ''),
-                        'added_by': q_data['added_by'],
-                        'is_approved': bool(q_data['is_approved']),
-                        'is_public': bool(q_data['is_public'])
-                    }
-                    question = Question(**clean_data)
-                else:
-                    question = Question(**q_data)
-                
-                # Only regular questions have company data
-                if q_data['id'] < 1000000:  # Regular question
-                    # Group company data by company name
-                    companies_dict = {}
-                    q_company_data = company_data.get(q_data['id'], [])
-                    
-                    for c_row in q_company_data:
-                        company_name = c_row['company_name']
-                        if company_name not in companies_dict:
-                            companies_dict[company_name] = {
-                                'frequency': c_row['frequency'],
-                                'time_periods': []
-                            }
-                        companies_dict[company_name]['time_periods'].append(c_row['time_period'])
-                    
-                    # Convert to CompanyData objects
-                    companies_formatted = {}
-                    for company_name, data in companies_dict.items():
-                        companies_formatted[company_name] = CompanyData(
-                            frequency=data['frequency'],
-                            time_periods=list(set(data['time_periods']))  # Remove duplicates
-                        )
-                else:  # User question - get company data if available
-                    companies_formatted = {}
-                    user_company_associations = user_company_data.get(q_data['id'], [])
-                    
-                    # Group user company data by company name
-                    companies_dict = {}
-                    for c_row in user_company_associations:
-                        company_name = c_row['company_name']
-                        if company_name not in companies_dict:
-                            companies_dict[company_name] = {
-                                'frequency': c_row['frequency'],
-                                'time_periods': []
-                            }
-                        companies_dict[company_name]['time_periods'].append(c_row['time_period'])
-                    
-                    # Convert to CompanyData objects
-                    for company_name, data in companies_dict.items():
-                        companies_formatted[company_name] = CompanyData(
-                            frequency=data['frequency'],
-                            time_periods=list(set(data['time_periods']))  # Remove duplicates
-                        )
-                
-                grouped_questions.append(GroupedCompanyQuestion(
-                    question=question,
-                    companies=companies_formatted
-                ))
-                
-            # Get filter statistics
-            stats_data = self.question_repo.get_filter_stats(filters)
-            stats = FilterStats(**stats_data)
+            grouped_questions = self._build_grouped_questions(
+                questions_data, user_questions_data, company_data, user_company_data
+            )
+            stats = FilterStats.model_construct(**stats_future.result())
             
             # Calculate total pages
             total_pages = (total + filters.per_page - 1) // filters.per_page
             
-            return QuestionResponse(
+            # Built from already-typed parts, so the wrappers skip validation
+            return QuestionResponse.model_construct(
                 questions=grouped_questions,
                 total=total,
                 page=filters.page,
@@ -178,6 +191,65 @@ class QuestionService(BaseService):
             logger.error(f"Failed to process questions for filters: {filters}")
             raise
     
+    def _get_user_company_data(self, user_question_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+        """Approved company associations for user questions, keyed by combined ID"""
+        user_company_data = {}
+        if user_question_ids:
+            logger.debug("Getting company data for %d user questions", len(user_question_ids))
+            # Every approved association for the page comes back in one query
+            company_data = self.user_question_repo.get_approved_company_data(
+                [q_id - USER_ID_OFFSET for q_id in user_question_ids]
+            )
+            user_company_data = {
+                USER_ID_OFFSET + user_q_id: company_rows
+                for user_q_id, company_rows in company_data.items()
+            }
+        return user_company_data
+    
+    @staticmethod
+    def _build_grouped_questions(
+        questions_data: List[Dict[str, Any]],
+        user_questions_data: List[Dict[str, Any]],
+        company_data: Dict[int, Dict[str, Dict[str, Any]]],
+        user_company_data: Dict[int, List[Dict[str, Any]]]
+    ) -> List[GroupedCompanyQuestion]:
+        """Pair each question row with its company data, regular questions first.
+        
+        The two kinds of row arrive in separate lists, so neither loop has to
+        tell them apart by ID.
+        """
+        # Local names for the per-row lookups
+        question_from_row = _question_from_row
+        group_companies = _group_companies
+        company_model = CompanyData.model_construct
+        grouped_model = GroupedCompanyQuestion.model_construct
+        regular_companies = company_data.get
+        user_companies = user_company_data.get
+        no_companies = {}
+        
+        # Regular questions carry companies already grouped by the batch lookup
+        grouped_questions = [
+            grouped_model(
+                question=question_from_row(q_data),
+                companies={
+                    company_name: company_model(**company_info)
+                    for company_name, company_info in regular_companies(q_data['id'], no_companies).items()
+                }
+            )
+            for q_data in questions_data
+        ]
+        
+        # User questions carry their approved associations; the repository already
+        # shapes their rows like regular questions
+        grouped_questions.extend(
+            grouped_model(
+                question=question_from_row(q_data),
+                companies=group_companies(user_companies(q_data['id'], ()))
+            )
+            for q_data in user_questions_data
+        )
+        return grouped_questions
+    
     def get_random_questions(self, filters: QuestionFilters, count: int, user_id: Optional[int] = None) -> QuestionResponse:
         """Get random questions based on filters"""
         logger.info(f"Service: Getting random questions with count: {count}, filters: {filters}, user_id: {user_id}")
@@ -185,159 +257,53 @@ class QuestionService(BaseService):
         try:
             # Get random questions with company data
             logger.debug("Calling question_repo.get_random_questions")
-            questions_data, total = self.question_repo.get_random_questions(filters, count, user_id)
-            logger.debug(f"Retrieved {len(questions_data)} random questions out of {total} possible")
+            questions_data, user_questions_data, total = self.question_repo.get_random_questions(filters, count, user_id)
+            logger.debug(f"Retrieved {len(questions_data) + len(user_questions_data)} random questions out of {total} possible")
+            
+            if not questions_data and not user_questions_data:
+                return _empty_response(page=1, per_page=count)
+            
+            regular_question_ids = [q['id'] for q in questions_data]
+            user_question_ids = [q['id'] for q in user_questions_data]
             
-            if not questions_data:
-                return QuestionResponse(
-                    questions=[],
-                    total=0,
-                    page=1,
-                    per_page=count,
-                    total_pages=0,
-                    stats=FilterStats(
-                        total_questions=0,
-                        easy_count=0,
-                        medium_count=0,
-                        hard_count=0,
-                        companies_count=0,
-                        time_periods=[],
-                        topics=[]
-                    )
-                )
+            # Topics come pre-split from the link tables, alongside the company lookups
+            topics_future = _query_pool.submit(
+                self.question_repo.get_topics_for_questions,
+                regular_question_ids, [q_id - USER_ID_OFFSET for q_id in user_question_ids]
+            )
             
             # Get all company data for these questions in one query
-            regular_question_ids = [q['id'] for q in questions_data if q['id'] < 1000000]
             company_data = {}
             if regular_question_ids:
                 company_data = self.question_repo.get_company_data_for_questions(regular_question_ids)
             
             # Get user company data for user questions
-            user_question_ids = [q['id'] for q in questions_data if q['id'] >= 1000000]
-            user_company_data = {}
-            
-            if user_question_ids:
-                # Need to convert to original user_question_id
-                original_user_q_ids = [q_id - 1000000 for q_id in user_question_ids]
-                
-                # Import here to avoid circular imports
-                from app.repositories.user_question_repository import UserQuestionRepository
-                user_repo = UserQuestionRepository()
-                
-                for user_q_id in original_user_q_ids:
-                    combined_id = 1000000 + user_q_id
-                    associations = user_repo.get_company_associations(user_q_id, is_approved_only=True)
-                    
-                    if associations:
-                        user_company_data[combined_id] = []
-                        for assoc in associations:
-                            user_company_data[combined_id].append({
-                                'company_name': getattr(assoc, 'company_name', 'Unknown'),
-                                'frequency': assoc.frequency,
-                                'time_period': assoc.time_period
-                            })
+            user_company_data = self._get_user_company_data(user_question_ids)
             
             # Transform to grouped format
-            grouped_questions = []
-            for q_data in questions_data:
-                # Handle user questions explicitly to ensure all fields are correct
-                if q_data['id'] >= 1000000:  # User question
-                    # Create a clean dict with exactly the fields needed by Question model
-                    clean_data = {
-                        'id': q_data['id'],
-                        'title': q_data['title'],
-                        'difficulty': q_data['difficulty'].upper() if q_data['difficulty'] else 'MEDIUM',  # Convert to uppercase
-                        'acceptance_rate': None if q_data.get('acceptance_rate') is None else q_data['acceptance_rate'],
-                        'link': q_data['link'],
-                        'topics': q_data.get('topics', ''),
-                        'description': q_data.get('description', ''),
-                        'added_by': q_data['added_by'],
-                        'is_approved': bool(q_data['is_approved']),
-                        'is_public': bool(q_data['is_public'])
-                    }
-                    question = Question(**clean_data)
-                else:
-                    question = Question(**q_data)
-                
-                # Only regular questions have company data
-                if q_data['id'] < 1000000:  # Regular question
-                    # Group company data by company name
-                    companies_dict = {}
-                    q_company_data = company_data.get(q_data['id'], [])
-                    
-                    for c_row in q_company_data:
-                        company_name = c_row['company_name']
-                        if company_name not in companies_dict:
-                            companies_dict[company_name] = {
-                                'frequency': c_row['frequency'],
-                                'time_periods': []
-                            }
-                        companies_dict[company_name]['time_periods'].append(c_row['time_period'])
-                    
-                    # Convert to CompanyData objects
-                    companies_formatted = {}
-                    for company_name, data in companies_dict.items():
-                        companies_formatted[company_name] = CompanyData(
-                            frequency=data['frequency'],
-                            time_periods=list(set(data['time_periods']))  # Remove duplicates
-                        )
-                else:  # User question - get company data if available
-                    companies_formatted = {}
-                    user_company_associations = user_company_data.get(q_data['id'], [])
-                    
-                    # Group user company data by company name
-                    companies_dict = {}
-                    for c_row in user_company_associations:
-                        company_name = c_row['company_name']
-                        if company_name not in companies_dict:
-                            companies_dict[company_name] = {
-                                'frequency': c_row['frequency'],
-                                'time_periods': []
-                            }
-                        companies_dict[company_name]['time_periods'].append(c_row['time_period'])
-                    
-                    # Convert to CompanyData objects
-                    for company_name, data in companies_dict.items():
-                        companies_formatted[company_name] = CompanyData(
-                            frequency=data['frequency'],
-                            time_periods=list(set(data['time_periods']))  # Remove duplicates
-                        )
-                
-                grouped_questions.append(GroupedCompanyQuestion(
-                    question=question,
-                    companies=companies_formatted
-                ))
-            
-            # Calculate filter stats
-            total_count = len(grouped_questions)
-            easy_count = sum(1 for q in grouped_questions if q.question.difficulty == 'EASY')
-            medium_count = sum(1 for q in grouped_questions if q.question.difficulty == 'MEDIUM')
-            hard_count = sum(1 for q in grouped_questions if q.question.difficulty == 'HARD')
+            grouped_questions = self._build_grouped_questions(
+                questions_data, user_questions_data, company_data, user_company_data
+            )
             
-            # Get unique companies and time periods
+            # Calculate filter stats in a single pass over the sample
+            difficulty_counts = Counter()
             companies_set = set()
             time_periods_set = set()
-            for question in grouped_questions:
-                for company_name, company_data in question.companies.items():
+            for grouped in grouped_questions:
+                difficulty_counts[grouped.question.difficulty] += 1
+                for company_name, company_info in grouped.companies.items():
                     companies_set.add(company_name)
-                    time_periods_set.update(company_data.time_periods)
-            
-            # Get unique topics
-            topics_set = set()
-            for question in grouped_questions:
-                if question.question.topics:
-                    topics_list = [t.strip() for t in question.question.topics.split(',') if t.strip()]
-                    topics_set.update(topics_list)
+                    time_periods_set.update(company_info.time_periods)
             
             # Create filter stats
             stats = FilterStats(
-                total_questions=total_count,
-                easy_count=easy_count,
-                medium_count=medium_count,
-                hard_count=hard_count,
+                total_questions=len(grouped_questions),
+                easy_count=difficulty_counts['EASY'],
+                medium_count=difficulty_counts['MEDIUM'],
+                hard_count=difficulty_counts['HARD'],
                 companies_count=len(companies_set),
                 time_periods=list(time_periods_set),
-                topics=list(topics_set)
+                topics=topics_future.result()
             )
             
             return QuestionResponse(
@@ -353,15 +319,15 @@ class QuestionService(BaseService):
             logger.error(f"Failed to process random questions for filters: {filters}")
             raise
     
-    def get_all_difficulties(self) -> List[str]:
+    def get_all_difficulties(self) -> Sequence[str]:
         """Get all available difficulty levels"""
-        return ["EASY", "MEDIUM", "HARD"]
+        return _DIFFICULTIES
     
-    def get_all_time_periods(self) -> List[str]:
+    def get_all_time_periods(self) -> Sequence[str]:
         """Get all available time periods"""
-        return ["30_days", "3_months", "6_months", "more_than_6_months", "all_time"]
+        return _TIME_PERIODS
     
-    def get_all_topics(self) -> List[str]:
+    def get_all_topics(self) -> Sequence[str]:
         """Get all unique topics"""
         try:
             return self.question_repo.get_all_topics()
@@ -391,83 +357,88 @@ class QuestionService(BaseService):
         logger.info("Getting overall statistics")
         
         try:
-            # Get total questions, companies, and relationships
-            stats_query = """
-                SELECT 
-                    (SELECT COUNT(*) FROM questions) as total_questions,
-                    (SELECT COUNT(*) FROM companies) as total_companies,
-                    (SELECT COUNT(*) FROM question_companies) as total_relationships
-            """
-            
-            stats_row = self.question_repo.execute_query_one(stats_query)
-            
-            if not stats_row:
-                return OverallStats(
-                    total_questions=0,
-                    total_companies=0,
-                    total_relationships=0,
-                    difficulty_distribution={},
-                    top_companies=[],
-                    popular_questions=[]
-                )
-            
-            # Get difficulty distribution
-            difficulty_query = "SELECT difficulty, COUNT(*) as count FROM questions GROUP BY difficulty"
-            difficulty_rows = self.question_repo.execute_query(difficulty_query)
-            difficulty_distribution = {row['difficulty']: row['count'] for row in difficulty_rows}
-            
-            # Get top companies
-            top_companies_query = """
-                SELECT c.name, COUNT(qc.question_id) as question_count, 
-                       MIN(qc.frequency) as min_freq, MAX(qc.frequency) as max_freq,
-                       AVG(qc.frequency) as avg_freq
-                FROM companies c
-                JOIN question_companies qc ON c.id = qc.company_id
-                GROUP BY c.id
-                ORDER BY question_count DESC
-                LIMIT 10
-            """
-            top_companies = self.question_repo.execute_query(top_companies_query)
-            top_companies_list = [
-                {
-                    'name': company['name'],
-                    'question_count': company['question_count'],
-                    'min_frequency': company['min_freq'],
-                    'max_frequency': company['max_freq'],
-                    'avg_frequency': company['avg_freq']
-                }
-                for company in top_companies
-            ]
-            
-            # Get popular questions
-            popular_questions_query = """
-                SELECT q.id, q.title, q.difficulty, COUNT(qc.company_id) as company_count,
-                       AVG(qc.frequency) as avg_frequency
-                FROM questions q
-                JOIN question_companies qc ON q.id = qc.question_id
-                GROUP BY q.id
-                ORDER BY company_count DESC, avg_frequency DESC
-                LIMIT 10
-            """
-            popular_questions = self.question_repo.execute_query(popular_questions_query)
-            popular_questions_list = [
-                {
-                    'id': q['id'],
-                    'title': q['title'],
-                    'difficulty': q['difficulty'],
-                    'company_count': q['company_count'],
-                    'avg_frequency': q['avg_frequency']
-                }
-                for q in popular_questions
-            ]
-            
-            return OverallStats(
-                total_questions=stats_row['total_questions'],
-                total_companies=stats_row['total_companies'],
-                total_relationships=stats_row['total_relationships'],
-                difficulty_distribution=difficulty_distribution,
-                top_companies=top_companies_list,
-                popular_questions=popular_questions_list
-            )
+            # Whole-table aggregates that move slowly; dashboards poll this endpoint
+            return _stats_cache.get_or_set("overall", self._compute_stats)
         except Exception as e:
             self.handle_error(e, "Error retrieving statistics")
+    
+    def _compute_stats(self) -> OverallStats:
+        """Run the aggregate queries behind get_stats"""
+        # Get total questions, companies, relationships and the difficulty distribution;
+        # json_group_object builds the distribution map in SQL
+        stats_query = """
+            SELECT 
+                (SELECT COUNT(*) FROM questions) as total_questions,
+                (SELECT COUNT(*) FROM companies) as total_companies,
+                (SELECT COUNT(*) FROM question_companies) as total_relationships,
+                (SELECT json_group_object(difficulty, count) FROM (
+                    SELECT difficulty, COUNT(*) as count FROM questions GROUP BY difficulty
+                )) as difficulty_distribution
+        """
+        
+        stats_row = self.question_repo.execute_query_one(stats_query)
+        
+        if not stats_row:
+            return OverallStats(
+                total_questions=0,
+                total_companies=0,
+                total_relationships=0,
+                difficulty_distribution={},
+                top_companies=[],
+                popular_questions=[]
+            )
+        
+        # Get top companies
+        top_companies_query = """
+            SELECT c.name, COUNT(qc.question_id) as question_count, 
+                   MIN(qc.frequency) as min_freq, MAX(qc.frequency) as max_freq,
+                   AVG(qc.frequency) as avg_freq
+            FROM companies c
+            JOIN question_companies qc ON c.id = qc.company_id
+            GROUP BY c.id
+            ORDER BY question_count DESC
+            LIMIT 10
+        """
+        top_companies = self.question_repo.execute_query(top_companies_query)
+        top_companies_list = [
+            {
+                'name': company['name'],
+                'question_count': company['question_count'],
+                'min_frequency': company['min_freq'],
+                'max_frequency': company['max_freq'],
+                'avg_frequency': company['avg_freq']
+            }
+            for company in top_companies
+        ]
+        
+        # Get popular questions
+        popular_questions_query = """
+            SELECT q.id, q.title, q.difficulty, COUNT(qc.company_id) as company_count,
+                   AVG(qc.frequency) as avg_frequency
+            FROM questions q
+            JOIN question_companies qc ON q.id = qc.question_id
+            GROUP BY q.id
+            ORDER BY company_count DESC, avg_frequency DESC
+            LIMIT 10
+        """
+        popular_questions = self.question_repo.execute_query(popular_questions_query)
+        popular_questions_list = [
+            {
+                'id': q['id'],
+                'title': q['title'],
+                'difficulty': q['difficulty'],
+                'company_count': q['company_count'],
+                'avg_frequency': q['avg_frequency']
+            }
+            for q in popular_questions
+        ]
+        
+        return OverallStats(
+            total_questions=stats_row['total_questions'],
+            total_companies=stats_row['total_companies'],
+            total_relationships=stats_row['total_relationships'],
+            difficulty_distribution=json.loads(stats_row['difficulty_distribution']),
+            top_companies=top_companies_list,
+            popular_questions=popular_questions_list
+        )
+
@@ -4,7 +4,9 @@ Service layer for user question management
 from typing import List, Optional, Tuple, Dict, Any
 from app.repositories.user_question_repository import UserQuestionRepository
 from app.repositories.user_repository import UserRepository
-from app.models.user_models import UserQuestion, QuestionReference, UserRole, QuestionDifficulty
+from app.models.user_models import (
+    UserQuestion, QuestionReference, UserQuestionCompany, UserRole, QuestionDifficulty
+)
 from app.schemas.user_question_schemas import (
     UserQuestionCreate, UserQuestionUpdate, UserQuestionResponse,
     QuestionReferenceCreate, QuestionReferenceResponse,
@@ -53,26 +55,49 @@ class UserQuestionService:
     
     def get_user_questions(self, user_id: Optional[int] = None, is_public_only: bool = False,
                           is_approved_only: bool = False, created_by: Optional[int] = None,
-                          page: int = 1, per_page: int = 20) -> QuestionListResponse:
+                          page: int = 1, per_page: int = 20,
+                          cursor_created_at: Optional[str] = None,
+                          cursor_id: Optional[int] = None) -> QuestionListResponse:
         """Get user questions with filtering"""
-        questions, total = self.user_question_repo.get_user_questions(
+        after = (cursor_created_at, cursor_id) if cursor_created_at and cursor_id else None
+        questions, total, next_cursor = self.user_question_repo.get_user_questions(
             user_id=user_id,
             is_public_only=is_public_only,
             is_approved_only=is_approved_only,
             created_by=created_by,
             page=page,
-            per_page=per_page
+            per_page=per_page,
+            after=after
         )
         
-        question_responses = [self._convert_to_response(q, user_id) for q in questions]
-        total_pages = (total + per_page - 1) // per_page
+        # Fetch the page's references and companies in one query each rather than per question
+        question_ids = [q.id for q in questions]
+        user = self.user_repo.get_user_by_id(user_id) if user_id else None
+        is_admin = user and user.role == UserRole.ADMIN
+        references = self.user_question_repo.get_question_references_bulk(
+            question_ids, is_approved_only=not is_admin
+        )
+        # All associations are shown for now, as in get_user_question_companies
+        associations = self.user_question_repo.get_company_associations_bulk(question_ids)
+        
+        question_responses = [
+            self._convert_to_response(
+                q, user_id,
+                references=[self._convert_reference_to_response(ref) for ref in references.get(q.id, [])],
+                companies=[self._convert_company_to_response(assoc) for assoc in associations.get(q.id, [])]
+            )
+            for q in questions
+        ]
+        total_pages = (total + per_page - 1) // per_page if total is not None else None
         
         return QuestionListResponse(
             questions=question_responses,
             total=total,
             page=page,
             per_page=per_page,
-            total_pages=total_pages
+            total_pages=total_pages,
+            next_cursor_created_at=next_cursor[0] if next_cursor else None,
+            next_cursor_id=next_cursor[1] if next_cursor else None
         )
     
     def update_user_question(self, question_id: int, question_data: UserQuestionUpdate,
@@ -156,6 +181,18 @@ class UserQuestionService:
         
         return self._convert_reference_to_response(reference)
     
+    def create_question_references_bulk(self, references: List[QuestionReferenceCreate],
+                                        user_id: int) -> int:
+        """Create several question references at once"""
+        user = self.user_repo.get_user_by_id(user_id)
+        auto_approve = bool(user and user.role == UserRole.ADMIN)
+        
+        return self.user_question_repo.create_question_references_bulk(
+            [(r.question_id, r.user_question_id, r.url, r.title, r.description) for r in references],
+            created_by=user_id,
+            auto_approve_admin=auto_approve
+        )
+    
     def get_question_references(self, question_id: Optional[int] = None,
                                user_question_id: Optional[int] = None,
                                user_id: Optional[int] = None) -> List[QuestionReferenceResponse]:
@@ -186,19 +223,7 @@ class UserQuestionService:
     def toggle_favorite(self, user_id: int, question_id: Optional[int] = None,
                        user_question_id: Optional[int] = None) -> bool:
         """Toggle question favorite status"""
-        favorites = self.user_question_repo.get_user_favorites(user_id)
-        
-        # Check if already favorited
-        is_favorited = any(
-            (fav['question_id'] == question_id and question_id is not None) or
-            (fav['user_question_id'] == user_question_id and user_question_id is not None)
-            for fav in favorites
-        )
-        
-        if is_favorited:
-            return self.user_question_repo.remove_favorite(user_id, question_id, user_question_id)
-        else:
-            return self.user_question_repo.add_favorite(user_id, question_id, user_question_id)
+        return self.user_question_repo.toggle_favorite(user_id, question_id, user_question_id)
     
     def get_user_favorites(self, user_id: int) -> List[Dict[str, Any]]:
         """Get user's favorite questions"""
@@ -243,16 +268,7 @@ class UserQuestionService:
     def create_company_association(self, question_id: int, company_data: UserQuestionCompanyCreate, 
                                  user_id: int) -> UserQuestionCompanyResponse:
         """Create a company association for user question"""
-        # Verify the question exists and user has permission
-        question = self.user_question_repo.get_user_question_by_id(question_id, user_id)
-        if not question:
-            raise ValueError("Question not found or access denied")
-        
-        # Verify user owns the question or is admin
-        if question.created_by != user_id:
-            user = self.user_repo.get_user_by_id(user_id)
-            if not user or user.role != UserRole.ADMIN:
-                raise ValueError("Permission denied")
+        self._check_can_edit_companies(question_id, user_id)
         
         # Create the company association
         association = self.user_question_repo.create_company_association(
@@ -279,6 +295,31 @@ class UserQuestionService:
             "approved_at": association.approved_at.isoformat() if association.approved_at else None
         }
     
+    def create_company_associations_bulk(self, question_id: int,
+                                         companies: List[UserQuestionCompanyCreate],
+                                         user_id: int) -> int:
+        """Create several company associations for a user question at once"""
+        self._check_can_edit_companies(question_id, user_id)
+        
+        return self.user_question_repo.create_company_associations_bulk(
+            question_id,
+            [(c.company_id, c.time_period, c.frequency) for c in companies],
+            created_by=user_id
+        )
+    
+    def _check_can_edit_companies(self, question_id: int, user_id: int) -> None:
+        """Raise ValueError unless the user owns the question or is an admin"""
+        # Verify the question exists and user has permission
+        question = self.user_question_repo.get_user_question_by_id(question_id, user_id)
+        if not question:
+            raise ValueError("Question not found or access denied")
+        
+        # Verify user owns the question or is admin
+        if question.created_by != user_id:
+            user = self.user_repo.get_user_by_id(user_id)
+            if not user or user.role != UserRole.ADMIN:
+                raise ValueError("Permission denied")
+    
     def get_user_question_companies(self, question_id: int, user_id: Optional[int] = None) -> List[UserQuestionCompanyResponse]:
         """Get company associations for a user question"""
         user = self.user_repo.get_user_by_id(user_id) if user_id else None
@@ -296,36 +337,25 @@ class UserQuestionService:
             is_approved_only=is_approved_only
         )
         
-        company_responses = []
-        for assoc in associations:
-            company_responses.append(UserQuestionCompanyResponse(
-                id=assoc.id,
-                company_id=assoc.company_id,
-                company_name=getattr(assoc, 'company_name', None),
-                time_period=assoc.time_period,
-                frequency=assoc.frequency,
-                is_approved=assoc.is_approved,
-                created_by=assoc.created_by,
-                creator_username=getattr(assoc, 'creator_username', None),
-                approved_by=assoc.approved_by,
-                approver_username=getattr(assoc, 'approver_username', None),
-                created_at=assoc.created_at,
-                approved_at=assoc.approved_at
-            ))
-        
-        return company_responses
+        return [self._convert_company_to_response(assoc) for assoc in associations]
     
     def _convert_to_response(self, user_question: UserQuestion, 
-                           current_user_id: Optional[int] = None) -> UserQuestionResponse:
-        """Convert UserQuestion model to response schema"""
+                           current_user_id: Optional[int] = None,
+                           references: Optional[List[QuestionReferenceResponse]] = None,
+                           companies: Optional[List[UserQuestionCompanyResponse]] = None) -> UserQuestionResponse:
+        """Convert UserQuestion model to response schema, fetching references/companies unless given"""
         # Get additional data
-        references = self.get_question_references(user_question_id=user_question.id, 
-                                                 user_id=current_user_id)
+        if references is None:
+            references = self.get_question_references(user_question_id=user_question.id, 
+                                                     user_id=current_user_id)
         
         # Get company associations
-        companies = self.get_user_question_companies(user_question.id, current_user_id)
+        if companies is None:
+            companies = self.get_user_question_companies(user_question.id, current_user_id)
         
-        return UserQuestionResponse(
+        # Fields come from already-typed repository models, so skip re-validation here;
+        # FastAPI still validates the response against the route's response_model
+        return UserQuestionResponse.model_construct(
             id=user_question.id,
             title=user_question.title,
             description=user_question.description,
@@ -347,9 +377,26 @@ class UserQuestionService:
             is_favorited=getattr(user_question, 'is_favorited', False)
         )
     
+    def _convert_company_to_response(self, assoc: UserQuestionCompany) -> UserQuestionCompanyResponse:
+        """Convert UserQuestionCompany model to response schema (trusted fields, not re-validated)"""
+        return UserQuestionCompanyResponse.model_construct(
+            id=assoc.id,
+            company_id=assoc.company_id,
+            company_name=getattr(assoc, 'company_name', None),
+            time_period=assoc.time_period,
+            frequency=assoc.frequency,
+            is_approved=assoc.is_approved,
+            created_by=assoc.created_by,
+            creator_username=getattr(assoc, 'creator_username', None),
+            approved_by=assoc.approved_by,
+            approver_username=getattr(assoc, 'approver_username', None),
+            created_at=assoc.created_at,
+            approved_at=assoc.approved_at
+        )
+    
     def _convert_reference_to_response(self, reference: QuestionReference) -> QuestionReferenceResponse:
-        """Convert QuestionReference model to response schema"""
-        return QuestionReferenceResponse(
+        """Convert QuestionReference model to response schema (trusted fields, not re-validated)"""
+        return QuestionReferenceResponse.model_construct(
             id=reference.id,
             url=reference.url,
             title=reference.title,
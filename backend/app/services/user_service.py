@@ -73,7 +73,7 @@ class UserService(BaseService):
         )
         
         # Remove password hash from user data
-        user_data = {k: v for k, v in user.items() if k != 'password_hash'}
+        user_data = {k: user[k] for k in user.keys() if k != 'password_hash'}
         
         return LoginResponse(
             access_token=access_token,
@@ -110,7 +110,7 @@ class UserService(BaseService):
             )
         
         # Remove password hash from user data
-        user_data = {k: v for k, v in user.items() if k != 'password_hash'}
+        user_data = {k: user[k] for k in user.keys() if k != 'password_hash'}
         return UserResponse(**user_data)
     
     def get_user_by_id(self, user_id: int) -> Optional[UserResponse]:
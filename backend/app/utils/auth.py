@@ -91,7 +91,7 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         password_hash=user['password_hash'],
         role=UserRole(user['role']),
         is_active=bool(user['is_active']),
-        created_at=datetime.fromisoformat(user['created_at'])
+        created_at=user['created_at']
     )
 
 
@@ -144,7 +144,7 @@ async def get_current_user_optional(credentials: Optional[HTTPAuthorizationCrede
             password_hash=user_data['password_hash'],
             role=UserRole(user_data['role']),
             is_active=bool(user_data['is_active']),
-            created_at=datetime.fromisoformat(user_data['created_at'])
+            created_at=user_data['created_at']
         )
         
         return user if user.is_active else None
@@ -3,12 +3,23 @@ Database connection management
 """
 import sqlite3
 import os
+import threading
 from contextlib import contextmanager
 from typing import Generator
 from app.config.settings import config
 from app.utils.logging import logger, log_exception
 
 
+def configure_connection(conn: sqlite3.Connection) -> None:
+    """Apply the configured PRAGMAs to a freshly opened connection"""
+    for pragma in config.database.pragmas:
+        try:
+            # journal_mode returns a row; fetch it so the statement completes
+            conn.execute(f"PRAGMA {pragma}").fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not apply PRAGMA {pragma}: {e}")
+
+
 class DatabaseManager:
     """Singleton database connection manager"""
     
@@ -20,9 +31,14 @@ class DatabaseManager:
         return cls._instance
     
     def __init__(self):
+        # The singleton is initialized once; re-running would drop open connections
+        if getattr(self, "_initialized", False):
+            return
+        self._initialized = True
         # Use relative path from the backend directory
         backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
         self.database_url = os.path.join(backend_dir, "devprep_problems.db")
+        self._local = threading.local()
         logger.info(f"Database initialized with path: {self.database_url}")
         # Check if the database file exists
         if not os.path.exists(self.database_url):
@@ -32,19 +48,49 @@ class DatabaseManager:
     
     @contextmanager
     def get_connection(self) -> Generator[sqlite3.Connection, None, None]:
-        """Get database connection with automatic cleanup"""
+        """Get this thread's database connection, committing or rolling back on exit.
+        
+        Connections are kept open per thread so sqlite3's prepared-statement
+        cache survives between queries; repeated SQL strings skip re-parsing.
+        Nested blocks on the same thread share the connection, and only the
+        outermost one commits or rolls back, so an inner block never ends its
+        caller's transaction.
+        """
+        conn = getattr(self._local, "conn", None)
+        depth = getattr(self._local, "depth", 0)
         try:
-            logger.debug(f"Opening database connection to {self.database_url}")
-            conn = sqlite3.connect(self.database_url)
-            conn.row_factory = sqlite3.Row
+            if conn is None:
+                logger.debug(f"Opening database connection to {self.database_url}")
+                conn = sqlite3.connect(
+                    self.database_url,
+                    cached_statements=config.database.statement_cache_size
+                )
+                conn.row_factory = sqlite3.Row
+                configure_connection(conn)
+                self._local.conn = conn
+            self._local.depth = depth + 1
             yield conn
+            if depth == 0 and conn.in_transaction:
+                conn.commit()
         except sqlite3.Error as e:
-            log_exception(e, f"Failed to connect to database at {self.database_url}")
+            if depth == 0 and conn is not None and conn.in_transaction:
+                conn.rollback()
+            log_exception(e, f"Database error on connection to {self.database_url}")
+            raise
+        except Exception:
+            if depth == 0 and conn is not None and conn.in_transaction:
+                conn.rollback()
             raise
         finally:
-            if 'conn' in locals():
-                logger.debug("Closing database connection")
-                conn.close()
+            self._local.depth = depth
+    
+    def close(self) -> None:
+        """Close the calling thread's connection, if any"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            logger.debug("Closing database connection")
+            conn.close()
+            self._local.conn = None
     
     def get_cursor(self, conn: sqlite3.Connection) -> sqlite3.Cursor:
         """Get cursor from connection"""
@@ -0,0 +1,115 @@
+"""
+Shared fixtures: a throwaway SQLite database with the production schema
+"""
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.config import database as database_config
+from app.repositories import question_repository, user_repository
+from app.repositories.company_repository import company_name_cache
+from app.services import company_service, question_service
+from app.utils.database import db_manager
+
+
+SCHEMA = """
+CREATE TABLE questions(
+    id INTEGER PRIMARY KEY, title TEXT, difficulty TEXT, acceptance_rate REAL, link TEXT, topics TEXT,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP, description TEXT, solution TEXT,
+    added_by INTEGER DEFAULT 1, is_approved INTEGER DEFAULT 1, is_public INTEGER DEFAULT 1
+);
+CREATE TABLE companies(id INTEGER PRIMARY KEY, name TEXT UNIQUE, created_at TEXT DEFAULT CURRENT_TIMESTAMP);
+CREATE TABLE company_questions(
+    id INTEGER PRIMARY KEY, company_id INTEGER, question_id INTEGER, frequency REAL, time_period TEXT
+);
+CREATE TABLE question_companies(
+    id INTEGER PRIMARY KEY, company_id INTEGER, question_id INTEGER, frequency REAL, time_period TEXT
+);
+CREATE TABLE users(
+    id INTEGER PRIMARY KEY, email TEXT UNIQUE, username TEXT UNIQUE, full_name TEXT, password_hash TEXT,
+    role TEXT DEFAULT 'user', is_active INTEGER DEFAULT 1, created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE user_questions(
+    id INTEGER PRIMARY KEY, title TEXT, description TEXT, difficulty TEXT, topics TEXT, solution TEXT, link TEXT,
+    is_public INTEGER DEFAULT 0, is_approved INTEGER DEFAULT 0, created_by INTEGER, approved_by INTEGER,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP, updated_at TEXT, approved_at TEXT
+);
+CREATE TABLE question_references(
+    id INTEGER PRIMARY KEY, question_id INTEGER, user_question_id INTEGER, url TEXT, title TEXT, description TEXT,
+    is_approved INTEGER DEFAULT 0, created_by INTEGER, approved_by INTEGER,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP, approved_at TEXT
+);
+CREATE TABLE user_question_companies(
+    id INTEGER PRIMARY KEY, user_question_id INTEGER, company_id INTEGER, time_period TEXT, frequency REAL,
+    is_approved INTEGER DEFAULT 0, created_by INTEGER, approved_by INTEGER,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP, approved_at TEXT
+);
+CREATE TABLE user_favorites(
+    id INTEGER PRIMARY KEY, user_id INTEGER, question_id INTEGER, user_question_id INTEGER,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE approval_requests(
+    id INTEGER PRIMARY KEY, request_type TEXT, entity_id INTEGER, entity_type TEXT, requested_by INTEGER,
+    status TEXT DEFAULT 'pending', admin_notes TEXT, processed_by INTEGER,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP, processed_at TEXT
+);
+INSERT INTO users(id, email, username, full_name, password_hash, role)
+VALUES (1, 'admin@example.com', 'admin', 'Admin', 'x', 'admin'),
+       (2, 'user@example.com', 'user', 'User', 'x', 'user');
+"""
+
+
+def _reset_state() -> None:
+    """Drop this thread's connection and every in-process cache"""
+    db_manager.close()
+    company_name_cache.invalidate()
+    question_repository.invalidate_filter_options()
+    question_repository._filter_stats_cache.invalidate()
+    question_service._stats_cache.invalidate()
+    question_service._page_cache.invalidate()
+    company_service._companies_cache.invalidate()
+    user_repository._username_cache.invalidate()
+    user_repository._user_cache.invalidate()
+    user_repository._user_count_cache.invalidate()
+
+
+@pytest.fixture
+def unmigrated_database(tmp_path, monkeypatch):
+    """Path of a fresh database with the original schema, before any migration"""
+    path = str(tmp_path / "devprep_test.db")
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    conn.close()
+
+    monkeypatch.setattr(db_manager, "database_url", path)
+    monkeypatch.setattr(database_config, "DATABASE_PATH", path)
+    # Pool threads keep their own connections, so give each test fresh threads
+    pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="test-query")
+    monkeypatch.setattr(question_service, "_query_pool", pool)
+    _reset_state()
+
+    yield path
+
+    pool.shutdown(wait=True)
+    _reset_state()
+
+
+@pytest.fixture
+def database(unmigrated_database):
+    """Path of a fresh, migrated database the application is pointed at"""
+    database_config.init_database()
+    return unmigrated_database
+
+
+@pytest.fixture
+def execute(unmigrated_database):
+    """Run SQL against the test database outside the application's connections"""
+    def run(sql: str, params=()):
+        conn = sqlite3.connect(unmigrated_database)
+        try:
+            with conn:
+                return conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+    return run
@@ -0,0 +1,48 @@
+"""
+Tests for the per-thread connection manager
+"""
+import sqlite3
+
+import pytest
+
+from app.utils.database import db_manager
+
+
+def _company_count(execute) -> int:
+    return execute("SELECT COUNT(*) FROM companies")[0][0]
+
+
+def test_nested_block_leaves_outer_transaction_open(database, execute):
+    with db_manager.get_connection() as conn:
+        conn.execute("INSERT INTO companies(name) VALUES ('Google')")
+        with db_manager.get_connection() as inner:
+            assert inner is conn
+            inner.execute("SELECT COUNT(*) FROM users").fetchone()
+        assert conn.in_transaction
+        assert _company_count(execute) == 0
+
+    assert _company_count(execute) == 1
+
+
+def test_failed_nested_block_keeps_outer_write(database, execute):
+    with db_manager.get_connection() as conn:
+        conn.execute("INSERT INTO companies(name) VALUES ('Google')")
+        with pytest.raises(sqlite3.OperationalError):
+            with db_manager.get_connection() as inner:
+                inner.execute("SELECT * FROM missing_table")
+        assert conn.in_transaction
+
+    assert _company_count(execute) == 1
+
+
+def test_failed_outer_block_rolls_back(database, execute):
+    with pytest.raises(RuntimeError):
+        with db_manager.get_connection() as conn:
+            conn.execute("INSERT INTO companies(name) VALUES ('Google')")
+            raise RuntimeError("boom")
+
+    assert _company_count(execute) == 0
+    # The next block starts from the outermost level again
+    with db_manager.get_connection() as conn:
+        conn.execute("INSERT INTO companies(name) VALUES ('Amazon')")
+    assert _company_count(execute) == 1
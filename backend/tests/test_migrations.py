@@ -0,0 +1,152 @@
+"""
+Tests for the startup migrations and the triggers they install
+"""
+import json
+import sqlite3
+
+import pytest
+
+from app.config import database as database_config
+
+
+def _max_frequency(execute, question_id: int):
+    return execute("SELECT max_frequency FROM questions WHERE id = ?", (question_id,))[0][0]
+
+
+def _topics(execute, question_id: int):
+    return [row[0] for row in execute(
+        "SELECT topic FROM question_topics WHERE question_id = ? ORDER BY topic", (question_id,)
+    )]
+
+
+def test_difficulty_order_ranks_difficulties(database, execute):
+    execute("""
+        INSERT INTO questions(id, title, difficulty)
+        VALUES (1, 'a', 'EASY'), (2, 'b', 'MEDIUM'), (3, 'c', 'HARD')
+    """)
+
+    assert execute("SELECT id, difficulty_order FROM questions ORDER BY id") == [(1, 1), (2, 2), (3, 3)]
+
+
+def test_max_frequency_follows_company_rows(database, execute):
+    execute("INSERT INTO questions(id, title, difficulty) VALUES (1, 'a', 'EASY'), (2, 'b', 'EASY')")
+    assert _max_frequency(execute, 1) is None
+
+    execute("INSERT INTO company_questions(id, company_id, question_id, frequency) VALUES (1, 1, 1, 10), (2, 2, 1, 30)")
+    assert _max_frequency(execute, 1) == 30
+
+    execute("UPDATE company_questions SET frequency = 5 WHERE id = 2")
+    assert _max_frequency(execute, 1) == 10
+
+    # Moving a row to another question refreshes both questions
+    execute("UPDATE company_questions SET question_id = 2, frequency = 40 WHERE id = 1")
+    assert _max_frequency(execute, 1) == 5
+    assert _max_frequency(execute, 2) == 40
+
+    execute("DELETE FROM company_questions WHERE id = 2")
+    assert _max_frequency(execute, 1) is None
+
+
+def test_question_topics_follow_questions(database, execute):
+    execute("INSERT INTO questions(id, title, topics) VALUES (1, 'a', 'Array, Graph,,Tree')")
+    assert _topics(execute, 1) == ["Array", "Graph", "Tree"]
+
+    execute("UPDATE questions SET topics = 'Math' WHERE id = 1")
+    assert _topics(execute, 1) == ["Math"]
+
+    execute("DELETE FROM questions WHERE id = 1")
+    assert _topics(execute, 1) == []
+
+
+def test_question_topics_keep_control_characters(database, execute):
+    execute("INSERT INTO questions(id, title, topics) VALUES (1, 'a', ?)", ("Array,Two\tPointers,Say \"hi\"\\",))
+    assert _topics(execute, 1) == ["Array", "Say \"hi\"\\", "Two\tPointers"]
+
+    execute("UPDATE questions SET topics = ? WHERE id = 1", ("Line\nBreak,Tree",))
+    assert _topics(execute, 1) == ["Line\nBreak", "Tree"]
+
+
+def test_user_question_topics_follow_user_questions(database, execute):
+    execute("INSERT INTO user_questions(id, title, topics) VALUES (1, 'a', ?)", (json.dumps(["Array", "Graph"]),))
+    execute("INSERT INTO user_questions(id, title, topics) VALUES (2, 'b', 'not json')")
+    assert execute("SELECT user_question_id, topic FROM user_question_topics ORDER BY 1, 2") == [
+        (1, "Array"), (1, "Graph"),
+    ]
+
+    execute("UPDATE user_questions SET topics = ? WHERE id = 1", (json.dumps(["Tree"]),))
+    execute("DELETE FROM user_questions WHERE id = 2")
+    assert execute("SELECT user_question_id, topic FROM user_question_topics") == [(1, "Tree")]
+
+
+def test_favorites_are_unique_per_user_and_question(database, execute):
+    execute("INSERT INTO user_favorites(user_id, question_id) VALUES (2, 5)")
+    execute("INSERT INTO user_favorites(user_id, user_question_id) VALUES (2, 5)")
+
+    with pytest.raises(sqlite3.IntegrityError):
+        execute("INSERT INTO user_favorites(user_id, question_id) VALUES (2, 5)")
+    with pytest.raises(sqlite3.IntegrityError):
+        execute("INSERT INTO user_favorites(user_id, user_question_id) VALUES (2, 5)")
+
+
+def test_user_lookups_use_unique_indexes(database, execute):
+    plan = execute("EXPLAIN QUERY PLAN SELECT id FROM users WHERE email = ?", ("user@example.com",))
+
+    assert any(row[-1].startswith("SEARCH users USING") for row in plan)
+    with pytest.raises(sqlite3.IntegrityError):
+        execute("INSERT INTO users(email, username) VALUES ('user@example.com', 'other')")
+
+
+def test_migrations_backfill_existing_rows(unmigrated_database, execute):
+    execute("INSERT INTO questions(id, title, topics) VALUES (1, 'a', 'Array,Graph')")
+    execute("INSERT INTO company_questions(company_id, question_id, frequency) VALUES (1, 1, 12), (2, 1, 7)")
+
+    database_config.init_database()
+
+    assert _topics(execute, 1) == ["Array", "Graph"]
+    assert _max_frequency(execute, 1) == 12
+
+
+def test_backfill_keeps_topics_with_control_characters(unmigrated_database, execute):
+    execute("INSERT INTO questions(id, title, topics) VALUES (1, 'a', ?)", ("Array,Two\tPointers",))
+
+    database_config.init_database()
+
+    assert _topics(execute, 1) == ["Array", "Two\tPointers"]
+
+
+def test_outdated_topic_triggers_are_replaced_and_backfilled(database, execute):
+    # A trigger from an older definition that recorded nothing for this row
+    execute("DROP TRIGGER trg_questions_topics_insert")
+    execute("CREATE TRIGGER trg_questions_topics_insert AFTER INSERT ON questions BEGIN SELECT 1; END")
+    execute("INSERT INTO questions(id, title, topics) VALUES (1, 'a', 'Array,Graph')")
+    assert _topics(execute, 1) == []
+
+    database_config.init_database()
+
+    assert _topics(execute, 1) == ["Array", "Graph"]
+    execute("INSERT INTO questions(id, title, topics) VALUES (2, 'b', 'Tree')")
+    assert _topics(execute, 2) == ["Tree"]
+
+
+def test_failed_migration_is_rolled_back_and_retried(unmigrated_database, execute, monkeypatch):
+    execute("INSERT INTO questions(id, title, topics) VALUES (1, 'a', 'Array')")
+    # The backfill fails at runtime, after the link table has been created
+    with monkeypatch.context() as patch:
+        patch.setattr(database_config, "_TOPIC_LINK_TABLES", (
+            ("questions", "question_topics", "question_id", "json_extract('not json', '$')"),
+        ))
+        database_config.init_database()
+
+    assert execute("SELECT name FROM sqlite_master WHERE name = 'question_topics'") == []
+
+    database_config.init_database()
+
+    assert _topics(execute, 1) == ["Array"]
+
+
+def test_migrations_are_idempotent(database, execute):
+    schema = execute("SELECT type, name, sql FROM sqlite_master ORDER BY name")
+
+    database_config.init_database()
+
+    assert execute("SELECT type, name, sql FROM sqlite_master ORDER BY name") == schema
@@ -0,0 +1,98 @@
+"""
+Tests for question filtering in the question repository
+"""
+import pytest
+
+from app.repositories.question_repository import QuestionRepository
+from app.schemas.question_schemas import QuestionFilters
+
+
+@pytest.fixture
+def company_questions(database, execute):
+    """Questions 1-3 asked by Google and Amazon in different time periods"""
+    execute("INSERT INTO companies(id, name) VALUES (1, 'Google'), (2, 'Amazon')")
+    for question_id, difficulty in ((1, 'EASY'), (2, 'MEDIUM'), (3, 'HARD')):
+        execute(
+            "INSERT INTO questions(id, title, difficulty, acceptance_rate, link, topics) VALUES (?, ?, ?, 50, ?, 'Array')",
+            (question_id, f"Question {question_id}", difficulty, f"https://example.com/{question_id}"),
+        )
+    links = [
+        (1, 1, '6_months'), (2, 1, '6_months'),   # both companies within 6 months
+        (1, 2, '6_months'), (2, 2, '30_days'),    # Amazon only in another period
+        (1, 3, '6_months'),                       # Google only
+    ]
+    for company_id, question_id, time_period in links:
+        for table in ('company_questions', 'question_companies'):
+            execute(
+                f"INSERT INTO {table}(company_id, question_id, frequency, time_period) VALUES (?, ?, 10, ?)",
+                (company_id, question_id, time_period),
+            )
+
+
+def _and_filters(**kwargs) -> QuestionFilters:
+    return QuestionFilters(companies="Google,Amazon", company_logic="AND", **kwargs)
+
+
+def test_and_companies_match_questions_asked_by_every_company(company_questions):
+    questions, total = QuestionRepository().get_filtered_questions(_and_filters())
+
+    assert sorted(q['id'] for q in questions) == [1, 2]
+    assert total == 2
+
+
+def test_and_companies_respect_time_periods(company_questions):
+    repo = QuestionRepository()
+    filters = _and_filters(time_periods="6_months")
+
+    questions, total = repo.get_filtered_questions(filters)
+    assert [q['id'] for q in questions] == [1]
+    assert total == 1
+
+    stats = repo.get_filter_stats(filters)
+    assert stats['total_questions'] == 1
+    assert (stats['easy_count'], stats['medium_count'], stats['hard_count']) == (1, 0, 0)
+
+    regular, _, total = repo.get_random_questions(filters, count=10)
+    assert [q['id'] for q in regular] == [1]
+    assert total == 1
+
+
+def test_and_companies_with_unknown_company_match_nothing(company_questions):
+    filters = QuestionFilters(companies="Google,Unknown", company_logic="AND")
+
+    questions, total = QuestionRepository().get_filtered_questions(filters)
+
+    assert questions == []
+    assert total == 0
+
+
+def test_unfiltered_stats_count_questions_with_company_data(company_questions, execute):
+    execute("INSERT INTO questions(id, title, difficulty) VALUES (4, 'No companies', 'EASY')")
+    execute("INSERT INTO questions(id, title, difficulty) VALUES (5, 'Unrated', NULL)")
+    execute("INSERT INTO company_questions(company_id, question_id, frequency, time_period) VALUES (1, 5, 1, '30_days')")
+
+    stats = QuestionRepository().get_filter_stats(QuestionFilters())
+
+    assert stats['total_questions'] == 4
+    assert (stats['easy_count'], stats['medium_count'], stats['hard_count']) == (1, 1, 1)
+    assert stats['companies_count'] == 2
+    assert stats['time_periods'] == ['30_days', '6_months']
+
+
+def test_unfiltered_random_questions_cover_the_id_range_evenly(database, execute):
+    for question_id in range(1, 201):
+        execute("INSERT INTO questions(id, title, difficulty) VALUES (?, ?, 'EASY')", (question_id, f"Q{question_id}"))
+    repo = QuestionRepository()
+    quartiles = [0, 0, 0, 0]
+    draws = 1000
+
+    for _ in range(draws):
+        questions, _, total = repo.get_random_questions(QuestionFilters(), count=5)
+        assert total == 200
+        assert len({q['id'] for q in questions}) == 5
+        for question in questions:
+            quartiles[(question['id'] - 1) // 50] += 1
+
+    # A uniform sample puts a quarter of the 5000 picks in each id quartile
+    expected = draws * 5 / 4
+    assert all(0.8 * expected < hits < 1.2 * expected for hits in quartiles), quartiles
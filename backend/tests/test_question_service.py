@@ -0,0 +1,78 @@
+"""
+Tests for the question listing page cache
+"""
+import pytest
+
+from app.models.user_models import QuestionDifficulty
+from app.repositories.user_question_repository import UserQuestionRepository
+from app.schemas.question_schemas import QuestionFilters
+from app.services import question_service
+from app.services.question_service import QuestionService
+
+
+@pytest.fixture
+def listed_questions(database, execute):
+    """25 questions asked by Google, plus one private user question of user 2"""
+    execute("INSERT INTO companies(id, name) VALUES (1, 'Google')")
+    for question_id in range(1, 26):
+        execute(
+            "INSERT INTO questions(id, title, difficulty, acceptance_rate, link, topics) VALUES (?, ?, 'EASY', 50, ?, 'Array')",
+            (question_id, f"Question {question_id}", f"https://example.com/{question_id}"),
+        )
+        execute(
+            "INSERT INTO company_questions(company_id, question_id, frequency, time_period) VALUES (1, ?, 10, '6_months')",
+            (question_id,),
+        )
+    return UserQuestionRepository().create_user_question("Mine", created_by=2, difficulty=QuestionDifficulty.EASY)
+
+
+@pytest.fixture
+def cache_every_page(monkeypatch):
+    """Cache pages regardless of result size or query time"""
+    monkeypatch.setattr(question_service, "_PAGE_CACHE_MIN_TOTAL", 0)
+    monkeypatch.setattr(question_service, "_PAGE_CACHE_MIN_SECONDS", 0.0)
+
+
+def test_repeated_page_is_served_from_cache(listed_questions, cache_every_page):
+    service = QuestionService()
+    filters = QuestionFilters(per_page=10)
+
+    first = service.get_filtered_questions(filters, user_id=2)
+
+    assert first.total == 26
+    assert service.get_filtered_questions(filters, user_id=2) is first
+
+
+def test_page_cache_is_per_user(listed_questions, cache_every_page):
+    service = QuestionService()
+    filters = QuestionFilters()
+
+    own = service.get_filtered_questions(filters, user_id=2)
+    other = service.get_filtered_questions(filters, user_id=1)
+
+    assert own.total == 26
+    assert other.total == 25
+
+
+def test_cheap_pages_are_not_cached(listed_questions):
+    service = QuestionService()
+    filters = QuestionFilters(search="Question 1")
+
+    first = service.get_filtered_questions(filters)
+
+    assert first.total < question_service._PAGE_CACHE_MIN_TOTAL
+    assert service.get_filtered_questions(filters) is not first
+
+
+def test_company_association_writes_retire_cached_pages(listed_questions, cache_every_page):
+    service = QuestionService()
+    repo = UserQuestionRepository()
+    filters = QuestionFilters()
+
+    first = service.get_filtered_questions(filters, user_id=2)
+    repo.create_company_association(listed_questions.id, 1, "6_months", 5.0, created_by=2)
+    second = service.get_filtered_questions(filters, user_id=2)
+    repo.create_company_associations_bulk(listed_questions.id, [(1, "30_days", 3.0)], created_by=2)
+
+    assert second is not first
+    assert service.get_filtered_questions(filters, user_id=2) is not second
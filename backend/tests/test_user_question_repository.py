@@ -0,0 +1,86 @@
+"""
+Tests for the user question repository
+"""
+import pytest
+
+from app.repositories.user_question_repository import UserQuestionRepository
+
+
+def test_bulk_references_request_approval_for_each_reference(database, execute):
+    created = UserQuestionRepository().create_question_references_bulk(
+        [(1, None, "https://example.com/a", "A", None), (None, 7, "https://example.com/b", None, "B")],
+        created_by=2,
+    )
+
+    assert created == 2
+    references = execute("SELECT id, url, is_approved FROM question_references ORDER BY id")
+    assert [(url, is_approved) for _, url, is_approved in references] == [
+        ("https://example.com/a", 0), ("https://example.com/b", 0),
+    ]
+    requests = execute("SELECT entity_id, entity_type, requested_by FROM approval_requests ORDER BY entity_id")
+    assert requests == [(reference_id, "question_reference", 2) for reference_id, _, _ in references]
+
+
+def test_admin_bulk_references_are_approved_without_requests(database, execute):
+    UserQuestionRepository().create_question_references_bulk(
+        [(1, None, "https://example.com/a", None, None)], created_by=1, auto_approve_admin=True,
+    )
+
+    assert execute("SELECT is_approved, approved_by, approved_at IS NOT NULL FROM question_references") == [(1, 1, 1)]
+    assert execute("SELECT COUNT(*) FROM approval_requests") == [(0,)]
+
+
+@pytest.fixture
+def user_questions(database, execute):
+    """Five public questions; 2 and 3 share a timestamp, so ids break the tie"""
+    for question_id, created_at in ((1, "2024-01-01 10:00:00"), (2, "2024-01-02 10:00:00"),
+                                    (3, "2024-01-02 10:00:00"), (4, "2024-01-03 10:00:00"),
+                                    (5, "2024-01-04 10:00:00")):
+        execute(
+            "INSERT INTO user_questions(id, title, difficulty, is_public, is_approved, created_by, created_at) "
+            "VALUES (?, ?, 'Easy', 1, 1, 2, ?)",
+            (question_id, f"Question {question_id}", created_at),
+        )
+
+
+def test_cursor_pages_walk_every_question_once(user_questions):
+    repo = UserQuestionRepository()
+
+    first, total, cursor = repo.get_user_questions(per_page=2)
+    assert [q.id for q in first] == [5, 4]
+    assert total == 5
+    assert cursor == ("2024-01-03 10:00:00", 4)
+
+    second, total, cursor = repo.get_user_questions(per_page=2, after=cursor)
+    assert [q.id for q in second] == [3, 2]
+    assert total is None
+    assert cursor == ("2024-01-02 10:00:00", 2)
+
+    last, total, cursor = repo.get_user_questions(per_page=2, after=cursor)
+    assert [q.id for q in last] == [1]
+    assert total is None
+    assert cursor is None
+
+
+def test_offset_pages_report_the_total(user_questions):
+    repo = UserQuestionRepository()
+
+    questions, total, cursor = repo.get_user_questions(page=3, per_page=2)
+    assert [q.id for q in questions] == [1]
+    assert (total, cursor) == (5, None)
+
+    questions, total, cursor = repo.get_user_questions(page=4, per_page=2)
+    assert (questions, total, cursor) == ([], 5, None)
+
+
+def test_cursor_pages_apply_filters_and_favorites(user_questions, execute):
+    execute("UPDATE user_questions SET created_by = 1 WHERE id IN (2, 4)")
+    execute("INSERT INTO user_favorites(user_id, user_question_id) VALUES (1, 2)")
+    repo = UserQuestionRepository()
+
+    questions, _, cursor = repo.get_user_questions(user_id=1, created_by=1, per_page=1)
+    assert [q.id for q in questions] == [4]
+
+    questions, total, cursor = repo.get_user_questions(user_id=1, created_by=1, per_page=1, after=cursor)
+    assert [(q.id, q.is_favorited) for q in questions] == [(2, True)]
+    assert (total, cursor) == (None, None)
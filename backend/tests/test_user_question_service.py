@@ -0,0 +1,38 @@
+"""
+Tests for user question listing responses
+"""
+from app.services.user_question_service import UserQuestionService
+
+
+def _add_questions(execute, count: int) -> None:
+    for question_id in range(1, count + 1):
+        execute(
+            "INSERT INTO user_questions(id, title, difficulty, is_public, is_approved, created_by, created_at) "
+            "VALUES (?, ?, 'Medium', 1, 1, 2, ?)",
+            (question_id, f"Question {question_id}", f"2024-01-{question_id:02d} 10:00:00"),
+        )
+
+
+def test_page_request_reports_totals_and_cursor(database, execute):
+    _add_questions(execute, 3)
+
+    response = UserQuestionService().get_user_questions(is_public_only=True, per_page=2)
+
+    assert [q.id for q in response.questions] == [3, 2]
+    assert (response.total, response.total_pages) == (3, 2)
+    assert (response.next_cursor_created_at, response.next_cursor_id) == ("2024-01-02 10:00:00", 2)
+
+
+def test_cursor_request_skips_totals(database, execute):
+    _add_questions(execute, 3)
+    service = UserQuestionService()
+
+    response = service.get_user_questions(
+        is_public_only=True, per_page=2, cursor_created_at="2024-01-02 10:00:00", cursor_id=2,
+    )
+
+    assert [q.id for q in response.questions] == [1]
+    assert (response.total, response.total_pages) == (None, None)
+    assert (response.next_cursor_created_at, response.next_cursor_id) == (None, None)
+    # The response still serializes with the optional fields left empty
+    assert response.model_dump()["total"] is None